@@ -9,7 +9,9 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
-from typing import TYPE_CHECKING
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Final, cast
 
 from onpy.api import schema
 from onpy.api.versioning import VersionTarget
@@ -17,6 +19,9 @@ from onpy.api.versioning import VersionTarget
 if TYPE_CHECKING:
     from onpy.api.rest_api import RestApi
 
+# how many featurescript results to keep around, across all elements
+_FEATURESCRIPT_CACHE_SIZE: Final = 256
+
 
 class EndpointContainer:
     """Container for different OnShape endpoints and their schemas."""
@@ -25,6 +30,39 @@ class EndpointContainer:
         """Construct a container instance from a rest api instance."""
         self.api = rest_api
 
+        # featurescripts only read the element, so their results are reused
+        # until a feature in that element is added, updated or deleted, or a
+        # version of its document is created
+        self._featurescript_cache: OrderedDict[
+            tuple,
+            str | schema.ApiModel,
+        ] = OrderedDict()
+        self._element_revisions: dict[tuple[str, str], int] = {}
+        self._cache_lock = Lock()
+
+    def _invalidate_element(self, document_id: str, element_id: str) -> None:
+        """Drop the cached featurescript results of an element.
+
+        Args:
+            document_id: The id of the document that owns the element
+            element_id: The id of the element that changed
+
+        """
+        with self._cache_lock:
+            key = (document_id, element_id)
+            self._element_revisions[key] = self._element_revisions.get(key, 0) + 1
+
+    def _invalidate_document(self, document_id: str) -> None:
+        """Drop the cached featurescript results of every element in a document.
+
+        Args:
+            document_id: The id of the document that changed
+
+        """
+        with self._cache_lock:
+            for key in [k for k in self._featurescript_cache if k[0] == document_id]:
+                del self._featurescript_cache[key]
+
     def documents(self) -> list[schema.Document]:
         """Fetch a list of documents that belong to the current user."""
         r = self.api.get(endpoint="/documents", response_type=schema.DocumentsResponse)
@@ -66,13 +104,42 @@ class EndpointContainer:
         script: str,
         return_type: type[T] = str,  # type: ignore[assignment]
     ) -> T:
-        """Evaluate a snipit of featurescript."""
-        return self.api.post(
+        """Evaluate a snipit of featurescript.
+
+        Results are cached until a feature in the element is changed, or a
+        version of the document is created, through this client. Changes made
+        elsewhere, e.g., in the browser, aren't seen until then. Each call gets
+        its own copy of the result, so callers may modify it freely.
+
+        """
+        with self._cache_lock:
+            revision = self._element_revisions.get((document_id, element_id), 0)
+            key = (
+                document_id,
+                version.wvm,
+                version.wvmid,
+                element_id,
+                revision,
+                script,
+                return_type,
+            )
+            if key in self._featurescript_cache:
+                self._featurescript_cache.move_to_end(key)
+                return cast("T", _copy_result(self._featurescript_cache[key]))
+
+        response = self.api.post(
             endpoint=f"/partstudios/d/{document_id}/{version.wvm}/{version.wvmid}/e/{element_id}/featurescript",
             response_type=return_type,
-            payload=schema.FeaturescriptUpload(script=script),
+            payload=schema.FeaturescriptUpload.model_construct(script=script),
         )
 
+        with self._cache_lock:
+            self._featurescript_cache[key] = _copy_result(response)
+            if len(self._featurescript_cache) > _FEATURESCRIPT_CACHE_SIZE:
+                self._featurescript_cache.popitem(last=False)
+
+        return response
+
     def list_features(
         self,
         document_id: str,
@@ -95,13 +162,16 @@ class EndpointContainer:
         feature: schema.Feature,
     ) -> schema.FeatureAddResponse:
         """Add a feature to the partstudio."""
-        return self.api.post(
-            endpoint=f"/partstudios/d/{document_id}/{version.wvm}/{version.wvmid}/e/{element_id}/features",
-            response_type=schema.FeatureAddResponse,
-            payload=schema.FeatureAddRequest(
-                feature=feature.model_dump(exclude_none=True),
-            ),
-        )
+        try:
+            return self.api.post(
+                endpoint=f"/partstudios/d/{document_id}/{version.wvm}/{version.wvmid}/e/{element_id}/features",
+                response_type=schema.FeatureAddResponse,
+                payload=schema.FeatureAddRequest.model_construct(
+                    feature=feature,
+                ),
+            )
+        finally:
+            self._invalidate_element(document_id, element_id)
 
     def update_feature(
         self,
@@ -111,13 +181,16 @@ class EndpointContainer:
         feature: schema.Feature,
     ) -> schema.FeatureAddResponse:
         """Update an existing feature."""
-        return self.api.post(
-            endpoint=f"/partstudios/d/{document_id}/w/{workspace_id}/e/{element_id}/features/featureid/{feature.featureId}",
-            response_type=schema.FeatureAddResponse,
-            payload=schema.FeatureAddRequest(
-                feature=feature.model_dump(exclude_none=True),
-            ),
-        )
+        try:
+            return self.api.post(
+                endpoint=f"/partstudios/d/{document_id}/w/{workspace_id}/e/{element_id}/features/featureid/{feature.featureId}",
+                response_type=schema.FeatureAddResponse,
+                payload=schema.FeatureAddRequest.model_construct(
+                    feature=feature,
+                ),
+            )
+        finally:
+            self._invalidate_element(document_id, element_id)
 
     def delete_feature(
         self,
@@ -127,10 +200,13 @@ class EndpointContainer:
         feature_id: str,
     ) -> None:
         """Delete a feature."""
-        self.api.delete(
-            endpoint=f"/partstudios/d/{document_id}/w/{workspace_id}/e/{element_id}/features/featureid/{feature_id}",
-            response_type=str,
-        )
+        try:
+            self.api.delete(
+                endpoint=f"/partstudios/d/{document_id}/w/{workspace_id}/e/{element_id}/features/featureid/{feature_id}",
+                response_type=str,
+            )
+        finally:
+            self._invalidate_element(document_id, element_id)
 
     def list_versions(self, document_id: str) -> list[schema.DocumentVersion]:
         """List the versions in a document in reverse-chronological order."""
@@ -148,7 +224,7 @@ class EndpointContainer:
         name: str,
     ) -> schema.DocumentVersion:
         """Create a new version from a workspace."""
-        return self.api.post(
+        version = self.api.post(
             f"/documents/d/{document_id}/versions",
             response_type=schema.DocumentVersion,
             payload=schema.DocumentVersionUpload(
@@ -157,6 +233,8 @@ class EndpointContainer:
                 workspaceId=workspace_id,
             ),
         )
+        self._invalidate_document(document_id)
+        return version
 
     def list_parts(
         self,
@@ -169,3 +247,18 @@ class EndpointContainer:
             endpoint=f"/parts/d/{document_id}/{version.wvm}/{version.wvmid}/e/{element_id}",
             response_type=schema.Part,
         )
+
+
+def _copy_result[T: str | schema.ApiModel](result: T) -> T:
+    """Copy a featurescript result so the cached one can't be modified.
+
+    Args:
+        result: The result to copy
+
+    Returns:
+        A deep copy of model results; strings are returned as-is
+
+    """
+    if isinstance(result, schema.ApiModel):
+        return result.model_copy(deep=True)
+    return result
@@ -14,15 +14,16 @@ from typing import TYPE_CHECKING, cast
 
 import requests
 from loguru import logger
+from pydantic import ValidationError
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 
 from onpy.api.endpoints import EndpointContainer
 from onpy.api.schema import ApiModel, HttpMethod
 from onpy.util.exceptions import OnPyApiError, OnPyInternalError
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
-
     from onpy.client import Client
 
 
@@ -40,6 +41,28 @@ class RestApi:
         """
         self.endpoints = EndpointContainer(self)
         self.client = client
+        self._session = self._make_session()
+
+    def _make_session(self) -> requests.Session:
+        """Create the HTTP session shared by every request from this client.
+
+        Reusing one session keeps connections to OnShape alive between calls,
+        so a script that adds many features doesn't pay for a new TLS handshake
+        on each one. Throttling and gateway errors are retried with backoff;
+        POSTs are never retried, since they may not be idempotent.
+        """
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.auth = self.get_auth()
+        return session
 
     def get_auth(self) -> HTTPBasicAuth:
         """Get the basic HTTP the authentication object."""
@@ -72,64 +95,72 @@ class RestApi:
             msg = f"Endpoint '{endpoint}' missing '/' prefix"
             raise OnPyInternalError(msg)
 
-        # match method enum to requests function
-        requests_func: Callable[..., requests.Response] = {
-            HttpMethod.Post: requests.post,
-            HttpMethod.Get: requests.get,
-            HttpMethod.Delete: requests.delete,
-            HttpMethod.Put: requests.put,
-        }[
-            http_method
-        ]  # type: ignore[assignment]
-
-        payload_json = None
+        # serialize straight to bytes once; this skips the intermediate dict
+        # and requests' own json encoder
+        payload_bytes = None
+        headers = None
 
         if isinstance(payload, ApiModel):
-            payload_json = payload.model_dump(exclude_none=True)
+            payload_bytes = payload.model_dump_json(exclude_none=True).encode()
+            headers = {"Content-Type": "application/json"}
 
         logger.debug(f"{http_method.name} {endpoint}")
-        logger.trace(
-            f"Calling {http_method.name} {endpoint}"
-            + (
-                f" with payload:\n{json.dumps(payload_json, indent=4)}"
+        logger.opt(lazy=True).trace(
+            "Calling {} {}{}",
+            lambda: http_method.name,
+            lambda: endpoint,
+            lambda: (
+                " with payload:\n"
+                + payload.model_dump_json(indent=4, exclude_none=True)
                 if payload
                 else ""
             ),
         )
 
         # TODO @kyle-tennison: wrap this in a try/except to catch timeouts
-        r = requests_func(
+        r = self._session.request(
+            method=http_method.value,
             url=self.BASE_URL + endpoint,
-            json=payload_json,
-            auth=self.get_auth(),
+            data=payload_bytes,
+            headers=headers,
         )
 
         if not r.ok:
             msg = f"Bad response {r.status_code}"
             raise OnPyApiError(msg, r)
 
-        # deserialize response
-        try:
-            if r.text.strip() == "":
-                response_dict: dict = {}  # allow empty responses
-            else:
-                response_dict = r.json()
-            logger.trace(
-                f"{http_method.name} {endpoint} responded with:\n"
-                f"{json.dumps(response_dict, indent=4)}",
-            )
-        except requests.JSONDecodeError as e:
-            msg = "Response is not json"
-            raise OnPyApiError(msg, r) from e
+        # deserialize response. models parse the raw bytes directly, which
+        # skips building an intermediate dict
+        body = r.content if r.content.strip() else b"{}"  # allow empty responses
 
+        response: ApiModel | str
         if issubclass(response_type, ApiModel):
-            return cast(T, response_type(**response_dict))
+            try:
+                response = response_type.model_validate_json(body)
+            except ValidationError as e:
+                if any(err["type"] == "json_invalid" for err in e.errors()):
+                    msg = "Response is not json"
+                    raise OnPyApiError(msg, r) from e
+                raise
+        elif issubclass(response_type, str):
+            try:
+                json.loads(body)
+            except json.JSONDecodeError as e:
+                msg = "Response is not json"
+                raise OnPyApiError(msg, r) from e
+            response = response_type(r.text)
+        else:
+            msg = f"Illegal response type: {response_type.__name__}"
+            raise OnPyInternalError(msg)
 
-        if issubclass(response_type, str):
-            return cast(T, response_type(r.text))
+        logger.opt(lazy=True).trace(
+            "{} {} responded with:\n{}",
+            lambda: http_method.name,
+            lambda: endpoint,
+            lambda: json.dumps(json.loads(body), indent=4),
+        )
 
-        msg = f"Illegal response type: {response_type.__name__}"
-        raise OnPyInternalError(msg)
+        return cast("T", response)
 
     def http_wrap_list[
         T: ApiModel | str
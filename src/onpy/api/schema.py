@@ -10,9 +10,9 @@ OnPy - May 2024 - Kyle Tennison
 from abc import abstractmethod
 from datetime import datetime
 from enum import Enum
-from typing import Protocol
+from typing import Final, Protocol
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, SerializeAsAny
 
 
 class HttpMethod(Enum):
@@ -24,6 +24,20 @@ class HttpMethod(Enum):
     Delete = "delete"
 
 
+# btType tags used in the parameter dicts that features build in `_to_model`.
+# Sharing one object per tag keeps the many payloads built by large scripts
+# from each holding their own copies.
+BT_PARAMETER_ENUM: Final = "BTMParameterEnum-145"
+BT_PARAMETER_QUERY_LIST: Final = "BTMParameterQueryList-148"
+BT_PARAMETER_QUANTITY: Final = "BTMParameterQuantity-147"
+BT_PARAMETER_BOOLEAN: Final = "BTMParameterBoolean-144"
+BT_PARAMETER_ARRAY: Final = "BTMParameterArray-2025"
+BT_ARRAY_PARAMETER_ITEM: Final = "BTMArrayParameterItem-1843"
+BT_INDIVIDUAL_QUERY: Final = "BTMIndividualQuery-138"
+BT_CURVE_GEOMETRY_CIRCLE: Final = "BTCurveGeometryCircle-115"
+BT_CURVE_GEOMETRY_LINE: Final = "BTCurveGeometryLine-117"
+
+
 class NameIdFetchable(Protocol):
     """A protocol for an object that can be fetched by name or id."""
 
@@ -186,7 +200,8 @@ class FeatureState(ApiModel):
 class FeatureAddRequest(ApiModel):
     """API Request to add a feature."""
 
-    feature: dict
+    # serialize as the concrete feature so subclass fields aren't dropped
+    feature: SerializeAsAny[Feature]
 
 
 class FeatureAddResponse(ApiModel):
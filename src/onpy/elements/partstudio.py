@@ -9,8 +9,12 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, override
 
+from loguru import logger
+
 from onpy.api import schema
 from onpy.api.versioning import WorkspaceWVM
 from onpy.elements.base import Element
@@ -19,9 +23,12 @@ from onpy.features import Extrude, Loft, OffsetPlane, Plane, Sketch
 from onpy.features.base import Feature, FeatureList
 from onpy.features.planes import DefaultPlane, DefaultPlaneOrientation
 from onpy.part import Part, PartList
+from onpy.util.exceptions import OnPyFeatureError
 from onpy.util.misc import unwrap
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from onpy.document import Document
 
 
@@ -43,6 +50,9 @@ class PartStudio(Element):
         self._model = model
         self._document = document
         self._features: list[Feature] = []
+        self._pending_features: list[Feature] = []
+        self._batching = False
+        self._default_plane_ids: dict[DefaultPlaneOrientation, str] | None = None
 
         self._features.extend(self._get_default_planes())
 
@@ -160,6 +170,76 @@ class PartStudio(Element):
         """
         return OffsetPlane(partstudio=self, owner=target, distance=distance, name=name)
 
+    @contextmanager
+    def batch(self, max_workers: int = 1) -> "Iterator[None]":
+        """Defer extrude, loft and offset plane uploads until the end of the block.
+
+        Features created inside the block are queued and uploaded together by
+        `commit` when the block exits. Their ids are unbound until then, so
+        don't query their entities or created parts inside the block. Offset
+        planes are the exception: using one, e.g., to place a sketch, commits
+        the queue early. If the block raises, the queued features are
+        discarded.
+
+        Args:
+            max_workers: Passed to `commit`; how many uploads to run at once
+
+        """
+        self._batching = True
+        try:
+            yield
+        except BaseException:
+            self._pending_features.clear()
+            raise
+        finally:
+            self._batching = False
+
+        self.commit(max_workers=max_workers)
+
+    def commit(self, max_workers: int = 1) -> None:
+        """Upload every feature queued by `batch`.
+
+        Queued features can't reference each other's geometry, since their ids
+        are unbound until now, so their add requests may run concurrently.
+        Responses are always recorded in the order the features were made.
+
+        Args:
+            max_workers: How many add requests to have in flight at once. With
+                more than one, the order of the features in OnShape's feature
+                list follows request completion instead of creation order.
+
+        Raises:
+            OnPyFeatureError if any feature fails to upload. Every other
+            feature is still uploaded and recorded first.
+
+        """
+        pending, self._pending_features = self._pending_features, []
+
+        logger.debug(f"Committing {len(pending)} queued features")
+
+        if max_workers <= 1 or len(pending) <= 1:
+            results = [_try_send_upload(feature) for feature in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_try_send_upload, pending))
+
+        # record every feature that reached OnShape, even if others failed, so
+        # the local feature list keeps matching the server's
+        errors: list[tuple[Feature, Exception]] = []
+        for feature, result in zip(pending, results, strict=True):
+            if isinstance(result, Exception):
+                errors.append((feature, result))
+                continue
+            try:
+                feature._finish_upload(result)
+            except OnPyFeatureError as e:
+                errors.append((feature, e))
+
+        if errors:
+            failed = ", ".join(f"'{feature.name}' ({e})" for feature, e in errors)
+            msg = f"Failed to upload queued features: {failed}"
+            raise OnPyFeatureError(msg) from errors[0][1]
+
     def list_parts(self) -> list[Part]:
         """Get a list of parts attached to the partstudio."""
         parts = self._api.endpoints.list_parts(
@@ -198,3 +278,19 @@ class PartStudio(Element):
     def __repr__(self) -> str:
         """Printable representation of the partstudio."""
         return super().__repr__()
+
+
+def _try_send_upload(feature: Feature) -> schema.FeatureAddResponse | Exception:
+    """Send a queued feature's add request, catching any error.
+
+    Args:
+        feature: The feature to upload
+
+    Returns:
+        The response to the add request, or the error it raised
+
+    """
+    try:
+        return feature._send_upload()
+    except Exception as e:  # noqa: BLE001
+        return e
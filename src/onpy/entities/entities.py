@@ -14,6 +14,7 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
+import sys
 from typing import override
 
 from onpy.entities.protocols import (
@@ -27,9 +28,16 @@ from onpy.entities.protocols import (
 class Entity:
     """A generic OnShape entity."""
 
+    __slots__ = ("transient_id",)
+
     def __init__(self, transient_id: str) -> None:
-        """Construct an entity from its transient id."""
-        self.transient_id = transient_id
+        """Construct an entity from its transient id.
+
+        The id is interned, so entities for the same geometry share one string
+        however many queries return them.
+
+        """
+        self.transient_id = sys.intern(transient_id)
 
     @classmethod
     def as_featurescript(cls) -> str:
@@ -42,12 +50,7 @@ class Entity:
     @staticmethod
     def match_string_type(string: str) -> type["Entity"]:
         """Match a string to the corresponding entity class."""
-        match = {
-            "VERTEX": VertexEntity,
-            "EDGE": EdgeEntity,
-            "FACE": FaceEntity,
-            "BODY": BodyEntity,
-        }.get(string.upper())
+        match = _ENTITY_TYPES.get(string.upper())
 
         if match is None:
             msg = f"'{string}' is not a valid entity type"
@@ -67,6 +70,8 @@ class Entity:
 class VertexEntity(Entity, VertexEntityConvertible):
     """An entity that is a vertex."""
 
+    __slots__ = ()
+
     @classmethod
     @override
     def as_featurescript(cls) -> str:
@@ -80,6 +85,8 @@ class VertexEntity(Entity, VertexEntityConvertible):
 class EdgeEntity(Entity, EdgeEntityConvertible):
     """An entity that is an edge."""
 
+    __slots__ = ()
+
     @classmethod
     @override
     def as_featurescript(cls) -> str:
@@ -93,6 +100,8 @@ class EdgeEntity(Entity, EdgeEntityConvertible):
 class FaceEntity(Entity, FaceEntityConvertible):
     """An entity that is a face."""
 
+    __slots__ = ()
+
     @classmethod
     @override
     def as_featurescript(cls) -> str:
@@ -106,6 +115,8 @@ class FaceEntity(Entity, FaceEntityConvertible):
 class BodyEntity(Entity, BodyEntityConvertible):
     """An entity that is a body."""
 
+    __slots__ = ()
+
     @classmethod
     @override
     def as_featurescript(cls) -> str:
@@ -114,3 +125,12 @@ class BodyEntity(Entity, BodyEntityConvertible):
     @override
     def _body_entities(self) -> list["BodyEntity"]:
         return [self]
+
+
+# entity classes by name, for `Entity.match_string_type`
+_ENTITY_TYPES: dict[str, type[Entity]] = {
+    "VERTEX": VertexEntity,
+    "EDGE": EdgeEntity,
+    "FACE": FaceEntity,
+    "BODY": BodyEntity,
+}
@@ -9,21 +9,56 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
+import json
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from textwrap import dedent
-from typing import TYPE_CHECKING, cast, override
+from typing import TYPE_CHECKING, Final, cast, override
 
 import onpy.entities.queries as qtypes
 from onpy.api import schema
 from onpy.api.versioning import WorkspaceWVM
 from onpy.entities import Entity, FaceEntity
 from onpy.entities.protocols import FaceEntityConvertible
-from onpy.util.exceptions import OnPyInternalError
 from onpy.util.misc import unwrap
 
 if TYPE_CHECKING:
     from onpy.elements.partstudio import PartStudio
 
 
+# the value of a featurescript value object, e.g., the id in a transient id
+_VALUE: Final = itemgetter("value")
+
+
+# evaluates any number of query blocks, collecting each one's matches in order
+_QUERY_SCRIPT = dedent(
+    """
+    function(context is Context, queries){{
+        var results is array = makeArray({count});
+    {blocks}
+        return results;
+    }}
+    """,
+)
+
+_UNION_BLOCK = """
+    // Combine all transient ids into one query
+    const transient_ids_{index} = {transient_ids};
+    var element_queries_{index} is array = mapArray(transient_ids_{index}, function(tid) {{
+        return {{ "queryType" : QueryType.TRANSIENT, "transientId" : tid }} as Query;
+    }});
+
+    var cumulative_query_{index} = qUnion(element_queries_{index});
+"""
+
+_QUERY_BLOCK = """
+    // Apply specific query
+    var specific_query_{index} = {specific_query};
+    results[{index}] = transientQueriesToStrings(evaluateQuery(context, specific_query_{index}));
+"""
+
+
 class EntityFilter[T: Entity](FaceEntityConvertible):
     """Object used to list and filter queries."""
 
@@ -35,83 +70,172 @@ class EntityFilter[T: Entity](FaceEntityConvertible):
             available: A list of available entities.
 
         """
-        self._available = available
+        self._resolved: list[T] | None = available
         self._partstudio = partstudio
         self._client = partstudio._client
         self._api = partstudio._api
 
-    @property
-    def _entity_type(self) -> type[T]:
-        """The class of the generic type T."""
-        orig_class = getattr(self, "__orig__class__", None)
+        # filters made by a query keep it here until their entities are needed
+        self._source: EntityFilter | None = None
+        self._query: qtypes.QueryType | None = None
+        self._result_type: type[Entity] = Entity
 
-        etype = orig_class.__args__[0] if orig_class else Entity
+        # a featurescript query that matches the same entities, if there is one
+        self._expression: str | None = None
 
-        if not callable(etype):
-            etype = Entity  # default to generic entity
+        self._ids_literal: str | None = None
 
-        if not issubclass(etype, Entity) or etype is not Entity:
-            msg = f"Found illegal etype: {etype}"
-            raise OnPyInternalError(msg)
+    @classmethod
+    def _from_expression(
+        cls,
+        partstudio: "PartStudio",
+        expression: str,
+    ) -> "EntityFilter[Entity]":
+        """Make a filter over the entities matched by a featurescript query.
 
-        return cast(type[T], etype)
+        Nothing is evaluated up front. Queries on the filter are applied to
+        the expression directly, so the server never has to rebuild the set
+        from its transient ids.
 
-    @override
-    def _face_entities(self) -> list[FaceEntity]:
-        return self.is_type(FaceEntity)._available
+        Args:
+            partstudio: The owning partstudio.
+            expression: A featurescript query expression, e.g.,
+                `qCreatedBy(makeId("..."))`
 
-    def _apply_query(self, query: "qtypes.QueryType") -> list[T]:
-        """Build the featurescript to evaluate a query and evaluates the featurescript.
+        Returns:
+            The new, unevaluated filter
 
-        Args:
-            query: The query to apply
+        """
+        entity_filter = EntityFilter[Entity](partstudio=partstudio, available=[])
+        entity_filter._resolved = None
+        entity_filter._expression = expression
+        return entity_filter
+
+    @property
+    def _available(self) -> list[T]:
+        """The entities in the filter, evaluating its query if needed."""
+        if self._resolved is None:
+            EntityFilter.evaluate(self)
+        return cast(list[T], self._resolved)
+
+    def _transient_ids_literal(self) -> str:
+        """Get the filter's transient ids as a featurescript array literal.
+
+        The same entity can be passed in more than once, so ids are only
+        included once. A filter's entities never change once evaluated, so
+        the literal is only built once, however many queries use it.
 
         Returns:
-            A list of resulting Entity instances
+            The featurescript array of transient id strings
 
         """
-        script = dedent(
-            f"""
+        if self._ids_literal is None:
+            unique_ids = dict.fromkeys(e.transient_id for e in self._available)
+            self._ids_literal = json.dumps(list(unique_ids))
+        return self._ids_literal
 
-        function(context is Context, queries){{
+    def _has_at_most_one(self) -> bool:
+        """Check if the filter is already known to hold one entity or none.
 
-            // Combine all transient ids into one query
-            const transient_ids = {[e.transient_id for e in self._available]};
-            var element_queries is array = makeArray(size(transient_ids));
+        Such a filter is its own largest and smallest entity, so those
+        queries can skip the request.
 
-            var idx = 0;
-            for (var tid in transient_ids)
-            {{
-                var query = {{ "queryType" : QueryType.TRANSIENT, "transientId" : tid }} as Query;
-                element_queries[idx] = query;
-                idx += 1;
-            }}
+        Returns:
+            True if the filter is evaluated and has at most one entity
 
-            var cumulative_query = qUnion(element_queries);
+        """
+        return self._resolved is not None and len(self._resolved) <= 1
 
-            // Apply specific query
-            var specific_query = {query.inject_featurescript("cumulative_query")};
-            var matching_entities = evaluateQuery(context, specific_query);
-            return transientQueriesToStrings(matching_entities);
+    @override
+    def _face_entities(self) -> list[FaceEntity]:
+        return self.is_type(FaceEntity)._available
 
-        }}
+    def _filtered[E: Entity](
+        self,
+        query: "qtypes.QueryType",
+        result_type: type[E],
+    ) -> "EntityFilter[E]":
+        """Make a filter that applies a query to this filter's entities.
 
-        """,
-        )
+        The query isn't evaluated until the new filter's entities are needed,
+        so that `evaluate` can send several queries at once.
 
-        result = unwrap(
-            self._api.endpoints.eval_featurescript(
-                self._partstudio.document.id,
-                version=WorkspaceWVM(self._partstudio.document.default_workspace.id),
-                element_id=unwrap(self._partstudio.id),
-                script=script,
-                return_type=schema.FeaturescriptResponse,
-            ).result,
-            message=f"Query raised error when evaluating fs. Script:\n\n{script}",
-        )
+        Args:
+            query: The query to apply
+            result_type: The entity class to build the results as
+
+        Returns:
+            The new, unevaluated filter
+
+        """
+        new_filter = EntityFilter[E](partstudio=self._partstudio, available=[])
+        new_filter._resolved = None
+        new_filter._source = self
+        new_filter._query = query
+        new_filter._result_type = result_type
+        return new_filter
+
+    @staticmethod
+    def evaluate(*filters: "EntityFilter") -> None:
+        """Evaluate the queries of several filters at once.
+
+        Filters are otherwise evaluated one at a time, the first time their
+        entities are needed. Evaluating a batch up front, e.g., one filter per
+        profile of a sketch, saves a round-trip per filter. Filters that are
+        already evaluated are skipped.
+
+        A chain of filters, like `faces.contains_point(p).largest()`, is
+        evaluated as one nested query over the last evaluated filter in the
+        chain, so it costs a single round-trip however long it is. The filters
+        in the middle of the chain are left unevaluated.
+
+        Args:
+            filters: The filters to evaluate. Filters on different partstudios
+                are sent as concurrent requests, one per partstudio.
 
-        transient_ids = [i["value"] for i in result["value"]]
-        return [self._entity_type(transient_id=tid) for tid in transient_ids]
+        """
+        pending = [f for f in dict.fromkeys(filters) if f._resolved is None]
+
+        if not pending:
+            return
+
+        batch: list[_PendingQuery] = []
+
+        for entity_filter in pending:
+            # walk back to the nearest evaluated filter, or the expression the
+            # chain started from, collecting the queries to apply on top of it
+            chain: list[qtypes.QueryType] = []
+            source = entity_filter
+            while source._resolved is None and source._source is not None:
+                chain.append(unwrap(source._query))
+                source = source._source
+            chain.reverse()
+
+            if source._resolved is not None and not source._resolved:
+                # every query narrows the available entities, so an empty
+                # filter stays empty without asking the server
+                entity_filter._resolved = []
+            elif source._expression is not None:
+                batch.append((entity_filter, None, source._expression, chain))
+            else:
+                ids_literal = source._transient_ids_literal()
+                batch.append((entity_filter, ids_literal, "", chain))
+
+        if not batch:
+            return
+
+        # filters on different partstudios can't share a script, but their
+        # requests don't depend on each other, so they are sent concurrently
+        by_partstudio: dict[str, list[_PendingQuery]] = {}
+        for pending_query in batch:
+            partstudio_id = unwrap(pending_query[0]._partstudio.id)
+            by_partstudio.setdefault(partstudio_id, []).append(pending_query)
+
+        if len(by_partstudio) == 1:
+            _evaluate_batch(batch)
+        else:
+            with ThreadPoolExecutor(max_workers=len(by_partstudio)) as executor:
+                list(executor.map(_evaluate_batch, by_partstudio.values()))
 
     def contains_point(self, point: tuple[float, float, float]) -> "EntityFilter":
         """Filter out all queries that don't contain the provided point.
@@ -122,10 +246,27 @@ class EntityFilter[T: Entity](FaceEntityConvertible):
         """
         query = qtypes.qContainsPoint(point=point, units=self._client.units)
 
-        return EntityFilter[T](
-            partstudio=self._partstudio,
-            available=self._apply_query(query),
-        )
+        return self._filtered(query, Entity)
+
+    def contains_points(
+        self,
+        points: Sequence[tuple[float, float, float]],
+    ) -> list["EntityFilter"]:
+        """Filter the entities by each of several points at once.
+
+        This is the same as calling `contains_point` once per point, except
+        that every filter is evaluated in a single request.
+
+        Args:
+            points: The points to use for filtering
+
+        Returns:
+            A filter for each point, in order
+
+        """
+        filters = [self.contains_point(point) for point in points]
+        EntityFilter.evaluate(*filters)
+        return filters
 
     def closest_to(self, point: tuple[float, float, float]) -> "EntityFilter":
         """Get the entity closest to the point.
@@ -136,28 +277,25 @@ class EntityFilter[T: Entity](FaceEntityConvertible):
         """
         query = qtypes.qClosestTo(point=point, units=self._client.units)
 
-        return EntityFilter[T](
-            partstudio=self._partstudio,
-            available=self._apply_query(query),
-        )
+        return self._filtered(query, Entity)
 
     def largest(self) -> "EntityFilter":
         """Get the largest entity."""
+        if self._has_at_most_one():
+            return EntityFilter(self._partstudio, list(self._available))
+
         query = qtypes.qLargest()
 
-        return EntityFilter[T](
-            partstudio=self._partstudio,
-            available=self._apply_query(query),
-        )
+        return self._filtered(query, Entity)
 
     def smallest(self) -> "EntityFilter":
         """Get the smallest entity."""
+        if self._has_at_most_one():
+            return EntityFilter(self._partstudio, list(self._available))
+
         query = qtypes.qSmallest()
 
-        return EntityFilter[T](
-            partstudio=self._partstudio,
-            available=self._apply_query(query),
-        )
+        return self._filtered(query, Entity)
 
     def intersects(
         self,
@@ -178,10 +316,7 @@ class EntityFilter[T: Entity](FaceEntityConvertible):
             units=self._client.units,
         )
 
-        return EntityFilter[T](
-            partstudio=self._partstudio,
-            available=self._apply_query(query),
-        )
+        return self._filtered(query, Entity)
 
     def is_type[E: Entity](self, entity_type: type[E]) -> "EntityFilter[E]":
         """Get the queries of a specific type.
@@ -193,12 +328,88 @@ class EntityFilter[T: Entity](FaceEntityConvertible):
         """
         query = qtypes.qEntityType(entity_type=entity_type)
 
-        available: list[E] = [
-            entity_type(e.transient_id) for e in self._apply_query(query)
-        ]
-
-        return EntityFilter[E](partstudio=self._partstudio, available=available)
+        return self._filtered(query, entity_type)
 
     def __str__(self) -> str:
         """Pretty string representation of the filter."""
         return f"EntityFilter({self._available})"
+
+
+# a filter to evaluate, with the array literal of transient ids to filter or
+# None, the query expression to filter otherwise, and the queries to apply
+type _PendingQuery = tuple[
+    EntityFilter,
+    str | None,
+    str,
+    list["qtypes.QueryType"],
+]
+
+
+def _evaluate_batch(batch: list[_PendingQuery]) -> None:
+    """Evaluate filters on the same partstudio in a single request.
+
+    Args:
+        batch: The filters to evaluate, with their queries
+
+    """
+    partstudio = batch[0][0]._partstudio
+
+    script = _build_query_script(
+        [(ids, expression, chain) for _, ids, expression, chain in batch],
+    )
+
+    result = unwrap(
+        partstudio._api.endpoints.eval_featurescript(
+            partstudio.document.id,
+            version=WorkspaceWVM(partstudio.document.default_workspace.id),
+            element_id=unwrap(partstudio.id),
+            script=script,
+            return_type=schema.FeaturescriptResponse,
+        ).result,
+        message=f"Query raised error when evaluating fs. Script:\n\n{script}",
+    )
+
+    for (entity_filter, *_), matches in zip(batch, result["value"], strict=True):
+        entity_filter._resolved = list(
+            map(entity_filter._result_type, map(_VALUE, matches["value"])),
+        )
+
+
+def _build_query_script(
+    queries: list[tuple[str | None, str, list["qtypes.QueryType"]]],
+) -> str:
+    """Build the featurescript that evaluates several queries at once.
+
+    Args:
+        queries: For each query, the array literal of transient ids to filter,
+            or None to filter the query expression that follows instead, and
+            the chain of queries to filter them with, applied in order
+
+    Returns:
+        A featurescript function that returns an array of the transient ids
+        matched by each query, in order
+
+    """
+    blocks = []
+
+    # queries over the same entities share one union of their ids
+    unions: dict[str, str] = {}
+
+    for index, (transient_ids, expression, chain) in enumerate(queries):
+        specific_query = expression
+        if transient_ids is not None:
+            if transient_ids not in unions:
+                blocks.append(
+                    _UNION_BLOCK.format(index=index, transient_ids=transient_ids),
+                )
+                unions[transient_ids] = f"cumulative_query_{index}"
+            specific_query = unions[transient_ids]
+
+        for query in chain:
+            specific_query = query.inject_featurescript(specific_query)
+
+        blocks.append(
+            _QUERY_BLOCK.format(index=index, specific_query=specific_query),
+        )
+
+    return _QUERY_SCRIPT.format(count=len(queries), blocks="".join(blocks))
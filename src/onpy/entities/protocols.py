@@ -23,6 +23,8 @@ if TYPE_CHECKING:
 class FaceEntityConvertible(Protocol):
     """A protocol used for items that can be converted into a list of face entities."""
 
+    __slots__ = ()
+
     @abstractmethod
     def _face_entities(self) -> list["FaceEntity"]:
         """Convert the current object into a list of face entities."""
@@ -33,6 +35,8 @@ class FaceEntityConvertible(Protocol):
 class VertexEntityConvertible(Protocol):
     """A protocol used for items that can be converted into a list of vertex entities."""
 
+    __slots__ = ()
+
     @abstractmethod
     def _vertex_entities(self) -> list["VertexEntity"]:
         """Convert the current object into a list of vertex entities."""
@@ -43,6 +47,8 @@ class VertexEntityConvertible(Protocol):
 class EdgeEntityConvertible(Protocol):
     """A protocol used for items that can be converted into a list of edge entities."""
 
+    __slots__ = ()
+
     @abstractmethod
     def _edge_entities(self) -> list["EdgeEntity"]:
         """Convert the current object into a list of edge entities."""
@@ -53,6 +59,8 @@ class EdgeEntityConvertible(Protocol):
 class BodyEntityConvertible(Protocol):
     """A protocol used for items that can be converted into a list of body entities."""
 
+    __slots__ = ()
+
     @abstractmethod
     def _body_entities(self) -> list["BodyEntity"]:
         """Convert the current object into a list of body entities."""
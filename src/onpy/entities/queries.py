@@ -7,18 +7,23 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
-from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import cached_property
 from typing import override
 
 from onpy.entities import Entity
 from onpy.util.misc import UnitSystem
 
 
-class QueryType(ABC):
-    """Used to represent the type of a query."""
+class QueryType:
+    """Used to represent the type of a query.
+
+    Queries are immutable, so the featurescript for their arguments is only
+    built once, however many times they are injected. This is a plain base
+    class rather than an ABC, since queries are built for every filter.
+
+    """
 
-    @abstractmethod
     def inject_featurescript(self, q_to_filter: str) -> str:
         """Generate featurescript that will create a Query object of this type.
 
@@ -26,7 +31,7 @@ class QueryType(ABC):
             q_to_filter: The internal query to filter
 
         """
-        ...
+        raise NotImplementedError
 
     @staticmethod
     def make_point_vector(point: tuple[float, float, float], units: UnitSystem) -> str:
@@ -77,31 +82,41 @@ class QueryType(ABC):
         return f"({value}*{units.fs_name})"
 
 
-@dataclass
+@dataclass(frozen=True)
 class qContainsPoint(QueryType):
     """Wrap the OnShape qContainsPoint query."""
 
     point: tuple[float, float, float]
     units: UnitSystem
 
+    @cached_property
+    def _point_vector(self) -> str:
+        """The point as a featurescript vector, built on first use."""
+        return self.make_point_vector(self.point, self.units)
+
     @override
     def inject_featurescript(self, q_to_filter: str) -> str:
-        return f"qContainsPoint({q_to_filter}, {self.make_point_vector(self.point, self.units)})"
+        return f"qContainsPoint({q_to_filter}, {self._point_vector})"
 
 
-@dataclass
+@dataclass(frozen=True)
 class qClosestTo(QueryType):
     """Wrap the OnShape qClosestTo query."""
 
     point: tuple[float, float, float]
     units: UnitSystem
 
+    @cached_property
+    def _point_vector(self) -> str:
+        """The point as a featurescript vector, built on first use."""
+        return self.make_point_vector(self.point, self.units)
+
     @override
     def inject_featurescript(self, q_to_filter: str) -> str:
-        return f"qClosestTo({q_to_filter}, {self.make_point_vector(self.point, self.units)})"
+        return f"qClosestTo({q_to_filter}, {self._point_vector})"
 
 
-@dataclass
+@dataclass(frozen=True)
 class qLargest(QueryType):
     """Wrap the OnShape qLargest query."""
 
@@ -110,7 +125,7 @@ class qLargest(QueryType):
         return f"qLargest({q_to_filter})"
 
 
-@dataclass
+@dataclass(frozen=True)
 class qSmallest(QueryType):
     """Wrap the OnShape qSmallest query."""
 
@@ -119,7 +134,7 @@ class qSmallest(QueryType):
         return f"qSmallest({q_to_filter})"
 
 
-@dataclass
+@dataclass(frozen=True)
 class qWithinRadius(QueryType):
     """Wrap the OnShape qWithinRadius query."""
 
@@ -132,7 +147,7 @@ class qWithinRadius(QueryType):
         return f"qWithinRadius({q_to_filter})"
 
 
-@dataclass
+@dataclass(frozen=True)
 class qIntersectsLine(QueryType):
     """Wrap the OnShape qIntersectsLine query."""
 
@@ -140,12 +155,17 @@ class qIntersectsLine(QueryType):
     line_direction: tuple[float, float, float]
     units: UnitSystem
 
+    @cached_property
+    def _line(self) -> str:
+        """The line as a featurescript expression, built on first use."""
+        return self.make_line(self.line_origin, self.line_direction, self.units)
+
     @override
     def inject_featurescript(self, q_to_filter: str) -> str:
-        return f"qIntersectsLine({q_to_filter}, {self.make_line(self.line_origin, self.line_direction, self.units)})"  # noqa: E501
+        return f"qIntersectsLine({q_to_filter}, {self._line})"
 
 
-@dataclass
+@dataclass(frozen=True)
 class qEntityType(QueryType):
     """Wrap the OnShape qEntityType query."""
 
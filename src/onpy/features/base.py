@@ -9,6 +9,7 @@ OnPy - May 2024 - Kyle Tennison
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from textwrap import dedent
 from typing import TYPE_CHECKING, cast
 
@@ -29,9 +30,22 @@ if TYPE_CHECKING:
     from onpy.features.planes import Plane
 
 
+_CREATED_PARTS_SCRIPT = dedent(
+    """
+    function(context is Context, queries) {{
+        var query = qCreatedBy(makeId("{feature_id}"), EntityType.BODY);
+
+        return transientQueriesToStrings( evaluateQuery(context, query) );
+    }}
+    """,
+)
+
+
 class Feature(ABC):
     """An abstract base class for OnShape elements."""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def partstudio(self) -> "PartStudio":
@@ -87,17 +101,38 @@ class Feature(ABC):
             OnPyFeatureError if the feature fails to load
 
         """
-        response = self._api.endpoints.add_feature(
+        self._finish_upload(self._send_upload())
+
+    def _send_upload(self) -> schema.FeatureAddResponse:
+        """Send the request that adds the feature to the partstudio. Does not
+        touch any local state, so it is safe to run from worker threads.
+
+        Returns:
+            The raw response to the add request
+
+        """
+        return self._api.endpoints.add_feature(
             document_id=self.document.id,
             version=WorkspaceWVM(self.document.default_workspace.id),
             element_id=self.partstudio.id,
             feature=self._to_model(),
         )
 
+    def _finish_upload(self, response: schema.FeatureAddResponse) -> None:
+        """Record an uploaded feature locally and check its status.
+
+        Args:
+            response: The response from `_send_upload`
+
+        Raises:
+            OnPyFeatureError if the feature fails to load
+
+        """
         self.partstudio._features.append(self)
+        status = response.featureState.featureStatus
 
-        if response.featureState.featureStatus != "OK":
-            if response.featureState.featureStatus == "WARNING":
+        if status != "OK":
+            if status == "WARNING":
                 logger.warning("Feature loaded with warning")
             else:
                 msg = "Feature errored on upload"
@@ -107,6 +142,23 @@ class Feature(ABC):
 
         self._load_response(response)
 
+    def _upload_or_queue(self) -> None:
+        """Upload the feature now, or queue it if the partstudio is batching."""
+        if self.partstudio._batching:
+            self.partstudio._pending_features.append(self)
+        else:
+            self._upload_feature()
+
+    def _ensure_uploaded(self) -> None:
+        """Commit the partstudio's queued features if this is one of them.
+
+        Features queued by a batch have no id until they are uploaded, so
+        anything that needs the id calls this first.
+
+        """
+        if self in self.partstudio._pending_features:
+            self.partstudio.commit()
+
     def _update_feature(self) -> None:
         """Update the feature in the cloud."""
         response = self._api.endpoints.update_feature(
@@ -116,8 +168,10 @@ class Feature(ABC):
             feature=self._to_model(),
         )
 
-        if response.featureState.featureStatus != "OK":
-            if response.featureState.featureStatus == "WARNING":
+        status = response.featureState.featureStatus
+
+        if status != "OK":
+            if status == "WARNING":
                 logger.warning("Feature loaded with warning")
             else:
                 msg = "Feature errored on update"
@@ -134,36 +188,33 @@ class Feature(ABC):
             A list of Part objects
 
         """
-        script = dedent(
-            f"""
-            function(context is Context, queries) {{
-                var query = qCreatedBy(makeId("{self.id}"), EntityType.BODY);
-
-                return transientQueriesToStrings( evaluateQuery(context, query) );
-            }}
-            """,
-        )
-
-        response = self._client._api.endpoints.eval_featurescript(
-            document_id=self.partstudio.document.id,
-            version=WorkspaceWVM(self.partstudio.document.default_workspace.id),
-            element_id=self.partstudio.id,
-            script=script,
-            return_type=schema.FeaturescriptResponse,
-        )
+        script = _CREATED_PARTS_SCRIPT.format(feature_id=self.id)
+        version = WorkspaceWVM(self.partstudio.document.default_workspace.id)
+
+        # the part list doesn't depend on the script's result, so fetch both
+        # at once and only intersect them locally
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            parts_future = executor.submit(
+                self._api.endpoints.list_parts,
+                document_id=self.partstudio.document.id,
+                version=version,
+                element_id=self.partstudio.id,
+            )
+            response = self._api.endpoints.eval_featurescript(
+                document_id=self.partstudio.document.id,
+                version=version,
+                element_id=self.partstudio.id,
+                script=script,
+                return_type=schema.FeaturescriptResponse,
+            )
+            available_parts = parts_future.result()
 
         part_ids_raw = unwrap(
             response.result,
             message="Featurescript failed get parts created by feature",
         )["value"]
 
-        part_ids = [i["value"] for i in part_ids_raw]
-
-        available_parts = self._api.endpoints.list_parts(
-            document_id=self.partstudio.document.id,
-            version=WorkspaceWVM(self.partstudio.document.default_workspace.id),
-            element_id=self.partstudio.id,
-        )
+        part_ids = frozenset(i["value"] for i in part_ids_raw)
 
         return [
             Part(self.partstudio, part)
@@ -185,23 +236,23 @@ class FeatureList:
 
     def __getitem__(self, name: str) -> Feature:
         """Get an item by its name."""
-        matches = [f for f in self._features if f.name == name]
+        found: Feature | None = None
 
-        if len(matches) == 0:
+        for f in self._features:
+            if f.name == name:
+                if found is not None:
+                    msg = f"Multiple '{name}' features. Use .get(id=...)"
+                    raise OnPyParameterError(msg)
+                found = f
+
+        if found is None:
             msg = f"No feature named '{name}'"
             raise OnPyParameterError(msg)
-        if len(matches) > 1:
-            msg = f"Multiple '{name}' features. Use .get(id=...)"
-            raise OnPyParameterError(msg)
-        return matches[0]
+        return found
 
     def __str__(self) -> str:
         """Pretty string representation of the feature list."""
-        msg = "FeatureList(\n"
-        for f in self._features:
-            msg += f"  {f}\n"
-        msg += ")"
-        return msg
+        return "FeatureList(\n" + "".join(f"  {f}\n" for f in self._features) + ")"
 
     @property
     def front_plane(self) -> "Plane":
@@ -7,23 +7,53 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
-from typing import TYPE_CHECKING, override
+from operator import attrgetter
+from typing import TYPE_CHECKING, Final, override
 
 from onpy.api import schema
 from onpy.api.schema import FeatureAddResponse
 from onpy.entities import EntityFilter
 from onpy.entities.protocols import BodyEntityConvertible, FaceEntityConvertible
 from onpy.features.base import Feature
-from onpy.part import Part
 from onpy.util.misc import unwrap
 
 if TYPE_CHECKING:
     from onpy.elements.partstudio import PartStudio
+    from onpy.part import Part
+
+_TRANSIENT_ID: Final = attrgetter("transient_id")
+
+# Parameters that are the same for every extrude. They are never mutated,
+# so sharing them between models is safe.
+_BODY_TYPE_PARAM: Final = {
+    "btType": schema.BT_PARAMETER_ENUM,
+    "parameterId": "bodyType",
+    "value": "SOLID",
+    "enumName": "ExtendedToolBodyType",
+}
+_END_BOUND_PARAM: Final = {
+    "btType": schema.BT_PARAMETER_ENUM,
+    "enumName": "BoundingType",
+    "value": "BLIND",
+    "parameterId": "endBound",
+}
 
 
 class Extrude(Feature):
     """Represents an extrusion feature."""
 
+    __slots__ = (
+        "_boolean_scope_ids",
+        "_id",
+        "_merge_with",
+        "_name",
+        "_partstudio",
+        "_subtract_from",
+        "_target_ids",
+        "distance",
+        "targets",
+    )
+
     def __init__(
         self,
         partstudio: "PartStudio",
@@ -53,9 +83,12 @@ class Extrude(Feature):
         self._merge_with = merge_with
         self._subtract_from = subtract_from
 
-        self._upload_feature()
+        self._target_ids = tuple(map(_TRANSIENT_ID, self.targets))
+        self._boolean_scope_ids = tuple(self._boolean_scope)
+
+        self._upload_or_queue()
 
-    def get_created_parts(self) -> list[Part]:
+    def get_created_parts(self) -> list["Part"]:
         """Get a list of the parts this feature created."""
         return self._get_created_parts_inner()
 
@@ -97,60 +130,50 @@ class Extrude(Feature):
         the extrude.
         """
         if self._subtract_from is not None:
-            return [e.transient_id for e in self._subtract_from._body_entities()]
+            return list(map(_TRANSIENT_ID, self._subtract_from._body_entities()))
 
         if self._merge_with is not None:
-            return [e.transient_id for e in self._merge_with._body_entities()]
+            return list(map(_TRANSIENT_ID, self._merge_with._body_entities()))
 
         return []
 
     @override
     def _to_model(self) -> schema.Extrude:
 
-        return schema.Extrude(
+        return schema.Extrude.model_construct(
             name=self.name,
             featureId=self._id,
             suppressed=False,
             parameters=[
+                _BODY_TYPE_PARAM,
                 {
-                    "btType": "BTMParameterEnum-145",
-                    "parameterId": "bodyType",
-                    "value": "SOLID",
-                    "enumName": "ExtendedToolBodyType",
-                },
-                {
-                    "btType": "BTMParameterEnum-145",
+                    "btType": schema.BT_PARAMETER_ENUM,
                     "value": self._extrude_bool_type,
                     "enumName": "NewBodyOperationType",
                     "parameterId": "operationType",
                 },
                 {
-                    "btType": "BTMParameterQueryList-148",
+                    "btType": schema.BT_PARAMETER_QUERY_LIST,
                     "queries": [
                         {
-                            "btType": "BTMIndividualQuery-138",
-                            "deterministicIds": [e.transient_id for e in self.targets],
+                            "btType": schema.BT_INDIVIDUAL_QUERY,
+                            "deterministicIds": self._target_ids,
                         },
                     ],
                     "parameterId": "entities",
                 },
+                _END_BOUND_PARAM,
                 {
-                    "btType": "BTMParameterEnum-145",
-                    "enumName": "BoundingType",
-                    "value": "BLIND",
-                    "parameterId": "endBound",
-                },
-                {
-                    "btType": "BTMParameterQuantity-147",
+                    "btType": schema.BT_PARAMETER_QUANTITY,
                     "expression": f"{self.distance} {self._client.units.extension}",
                     "parameterId": "depth",
                 },
                 {
-                    "btType": "BTMParameterQueryList-148",
+                    "btType": schema.BT_PARAMETER_QUERY_LIST,
                     "queries": [
                         {
-                            "btType": "BTMIndividualQuery-138",
-                            "deterministicIds": self._boolean_scope,
+                            "btType": schema.BT_INDIVIDUAL_QUERY,
+                            "deterministicIds": self._boolean_scope_ids,
                         },
                     ],
                     "parameterId": "booleanScope",
@@ -7,23 +7,87 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
-from typing import TYPE_CHECKING, override
+from operator import attrgetter
+from typing import TYPE_CHECKING, Final, override
 
 from onpy.api import schema
 from onpy.api.schema import FeatureAddResponse
 from onpy.entities import EntityFilter, FaceEntity
 from onpy.entities.protocols import FaceEntityConvertible
 from onpy.features.base import Feature
-from onpy.part import Part
 from onpy.util.misc import unwrap
 
 if TYPE_CHECKING:
     from onpy.elements.partstudio import PartStudio
+    from onpy.part import Part
+
+_TRANSIENT_ID: Final = attrgetter("transient_id")
+
+# Parameters that are the same for every loft. They are never mutated,
+# so sharing them between models is safe.
+_BODY_TYPE_PARAM: Final = {
+    "btType": schema.BT_PARAMETER_ENUM,
+    "namespace": "",
+    "enumName": "ExtendedToolBodyType",
+    "value": "SOLID",
+    "parameterId": "bodyType",
+}
+_OPERATION_TYPE_PARAM: Final = {
+    "btType": schema.BT_PARAMETER_ENUM,
+    "namespace": "",
+    "enumName": "NewBodyOperationType",
+    "value": "NEW",
+    "parameterId": "operationType",
+}
+_SURFACE_OPERATION_TYPE_PARAM: Final = {
+    "btType": schema.BT_PARAMETER_ENUM,
+    "namespace": "",
+    "enumName": "NewSurfaceOperationType",
+    "value": "NEW",
+    "parameterId": "surfaceOperationType",
+}
+
+
+def _make_loft_item(transient_ids: tuple[str, ...]) -> dict:
+    """Build the entry for one profile in the loft's profile array.
+
+    Args:
+        transient_ids: The transient ids of the profile's faces
+
+    Returns:
+        The array item dict for the profile
+
+    """
+    return {
+        "btType": schema.BT_ARRAY_PARAMETER_ITEM,
+        "parameters": [
+            {
+                "btType": schema.BT_PARAMETER_QUERY_LIST,
+                "queries": [
+                    {
+                        "btType": schema.BT_INDIVIDUAL_QUERY,
+                        "deterministicIds": transient_ids,
+                    },
+                ],
+                "parameterId": "sheetProfileEntities",
+            },
+        ],
+    }
 
 
 class Loft(Feature):
     """Interface to lofting between two 2D profiles."""
 
+    __slots__ = (
+        "_end_ids",
+        "_id",
+        "_name",
+        "_partstudio",
+        "_start_ids",
+        "end_faces",
+        "start_faces",
+    )
+
     def __init__(
         self,
         partstudio: "PartStudio",
@@ -47,9 +111,12 @@ class Loft(Feature):
         self.start_faces: list[FaceEntity] = start_face._face_entities()
         self.end_faces: list[FaceEntity] = end_face._face_entities()
 
-        self._upload_feature()
+        self._start_ids = tuple(map(_TRANSIENT_ID, self.start_faces))
+        self._end_ids = tuple(map(_TRANSIENT_ID, self.end_faces))
+
+        self._upload_or_queue()
 
-    def get_created_parts(self) -> list[Part]:
+    def get_created_parts(self) -> list["Part"]:
         """Get a list of the parts this feature created."""
         return self._get_created_parts_inner()
 
@@ -81,68 +148,18 @@ class Loft(Feature):
     @override
     def _to_model(self) -> schema.Loft:
 
-        return schema.Loft(
+        return schema.Loft.model_construct(
             name=self.name,
             suppressed=False,
             parameters=[
+                _BODY_TYPE_PARAM,
+                _OPERATION_TYPE_PARAM,
+                _SURFACE_OPERATION_TYPE_PARAM,
                 {
-                    "btType": "BTMParameterEnum-145",
-                    "namespace": "",
-                    "enumName": "ExtendedToolBodyType",
-                    "value": "SOLID",
-                    "parameterId": "bodyType",
-                },
-                {
-                    "btType": "BTMParameterEnum-145",
-                    "namespace": "",
-                    "enumName": "NewBodyOperationType",
-                    "value": "NEW",
-                    "parameterId": "operationType",
-                },
-                {
-                    "btType": "BTMParameterEnum-145",
-                    "namespace": "",
-                    "enumName": "NewSurfaceOperationType",
-                    "value": "NEW",
-                    "parameterId": "surfaceOperationType",
-                },
-                {
-                    "btType": "BTMParameterArray-2025",
+                    "btType": schema.BT_PARAMETER_ARRAY,
                     "items": [
-                        {
-                            "btType": "BTMArrayParameterItem-1843",
-                            "parameters": [
-                                {
-                                    "btType": "BTMParameterQueryList-148",
-                                    "queries": [
-                                        {
-                                            "btType": "BTMIndividualQuery-138",
-                                            "deterministicIds": [
-                                                e.transient_id for e in self.start_faces
-                                            ],
-                                        },
-                                    ],
-                                    "parameterId": "sheetProfileEntities",
-                                },
-                            ],
-                        },
-                        {
-                            "btType": "BTMArrayParameterItem-1843",
-                            "parameters": [
-                                {
-                                    "btType": "BTMParameterQueryList-148",
-                                    "queries": [
-                                        {
-                                            "btType": "BTMIndividualQuery-138",
-                                            "deterministicIds": [
-                                                e.transient_id for e in self.end_faces
-                                            ],
-                                        },
-                                    ],
-                                    "parameterId": "sheetProfileEntities",
-                                },
-                            ],
-                        },
+                        _make_loft_item(self._start_ids),
+                        _make_loft_item(self._end_ids),
                     ],
                     "parameterId": "sheetProfilesArray",
                 },
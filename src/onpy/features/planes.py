@@ -7,11 +7,10 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
-import functools
 from abc import abstractmethod
 from enum import Enum
 from textwrap import dedent
-from typing import TYPE_CHECKING, Never, override
+from typing import TYPE_CHECKING, Final, Never, override
 
 from onpy.api import schema
 from onpy.api.versioning import WorkspaceWVM
@@ -27,6 +26,8 @@ if TYPE_CHECKING:
 class Plane(Feature):
     """Abstract Base Class for all Planes."""
 
+    __slots__ = ()
+
     @property
     @override
     def entities(self) -> EntityFilter:
@@ -63,9 +64,36 @@ class DefaultPlaneOrientation(Enum):
     RIGHT = "Right"
 
 
+# loads every default plane's transient id at once, in the same order as
+# DefaultPlaneOrientation
+_DEFAULT_PLANES_SCRIPT: Final = dedent(
+    """
+    function(context is Context, queries) {
+        return [
+            transientQueriesToStrings(evaluateQuery(context, qCreatedBy(makeId("Top"), EntityType.FACE))),
+            transientQueriesToStrings(evaluateQuery(context, qCreatedBy(makeId("Front"), EntityType.FACE))),
+            transientQueriesToStrings(evaluateQuery(context, qCreatedBy(makeId("Right"), EntityType.FACE)))
+        ];
+    }
+    """,  # noqa: E501
+)
+
+_OFFSET_PLANE_SCRIPT = dedent(
+    """
+    function(context is Context, queries) {{
+        var feature_id = makeId("{feature_id}");
+        var face = evaluateQuery(context, qCreatedBy(feature_id, EntityType.FACE))[0];
+        return transientQueriesToStrings(face);
+    }}
+    """,
+)
+
+
 class DefaultPlane(Plane):
     """Used to reference the default planes that OnShape generates."""
 
+    __slots__ = ("_partstudio", "_transient_id", "orientation")
+
     def __init__(
         self,
         partstudio: "PartStudio",
@@ -80,6 +108,7 @@ class DefaultPlane(Plane):
         """
         self._partstudio = partstudio
         self.orientation = orientation
+        self._transient_id: str | None = None
 
     @property
     @override
@@ -91,10 +120,12 @@ class DefaultPlane(Plane):
     def id(self) -> str:
         return self.transient_id  # we don't need the feature id of the default plane
 
-    @functools.cached_property
+    @property
     @override
     def transient_id(self) -> str:
-        return self._load_plane_id()
+        if self._transient_id is None:
+            self._transient_id = self._load_plane_id()
+        return self._transient_id
 
     @property
     @override
@@ -104,33 +135,49 @@ class DefaultPlane(Plane):
     def _load_plane_id(self) -> str:
         """Load the plane id.
 
+        The ids of all three default planes are fetched together the first
+        time any of them is needed, and kept on the partstudio.
+
         Returns:
             The plane ID
 
         """
-        plane_script = dedent(
-            """
-            function(context is Context, queries) {
-                return transientQueriesToStrings(evaluateQuery(context, qCreatedBy(makeId("ORIENTATION"), EntityType.FACE)));
-            }
-            """.replace(  # noqa: E501
-                "ORIENTATION",
-                self.orientation.value,
-            ),
-        )
+        plane_ids = self.partstudio._default_plane_ids
+
+        if plane_ids is None:
+            plane_ids = self._load_all_plane_ids()
+            self.partstudio._default_plane_ids = plane_ids
+
+        return plane_ids[self.orientation]
+
+    def _load_all_plane_ids(self) -> dict[DefaultPlaneOrientation, str]:
+        """Load the ids of every default plane in the partstudio.
+
+        Returns:
+            A mapping from each orientation to its plane ID
 
+        """
         response = self._client._api.endpoints.eval_featurescript(
             document_id=self.document.id,
             version=WorkspaceWVM(self.document.default_workspace.id),
             element_id=self.partstudio.id,
-            script=plane_script,
+            script=_DEFAULT_PLANES_SCRIPT,
             return_type=schema.FeaturescriptResponse,
         )
 
-        return unwrap(
+        plane_ids = unwrap(
             response.result,
-            message="Featurescript failed to load default plane",
-        )["value"][0]["value"]
+            message="Featurescript failed to load default planes",
+        )["value"]
+
+        return {
+            orientation: plane_id["value"][0]["value"]
+            for orientation, plane_id in zip(
+                DefaultPlaneOrientation,
+                plane_ids,
+                strict=True,
+            )
+        }
 
     @override
     def _to_model(self) -> Never:
@@ -146,6 +193,16 @@ class DefaultPlane(Plane):
 class OffsetPlane(Plane):
     """Represents a linearly offset plane."""
 
+    __slots__ = (
+        "_id",
+        "_name",
+        "_owner",
+        "_owner_ids",
+        "_partstudio",
+        "_transient_id",
+        "distance",
+    )
+
     def __init__(
         self,
         partstudio: "PartStudio",
@@ -167,9 +224,12 @@ class OffsetPlane(Plane):
         self._name = name
 
         self._id: str | None = None
+        self._transient_id: str | None = None
         self.distance = distance
 
-        self._upload_feature()
+        self._owner_ids = tuple(self._get_owner_transient_ids())
+
+        self._upload_or_queue()
 
     @property
     def owner(self) -> Plane | FaceEntityConvertible:
@@ -192,24 +252,29 @@ class OffsetPlane(Plane):
     @override
     def id(self) -> str:
         """The element id of the plane."""
+        self._ensure_uploaded()
         return unwrap(self._id, "Plane id unbound")
 
     @property
     @override
     def transient_id(self) -> str:
-        """The transient ID of the plane."""
-        script = dedent(
-            f"""
+        """The transient ID of the plane.
 
-        function(context is Context, queries) {{
+        The plane is never re-uploaded, so this is only fetched once.
 
-            var feature_id = makeId("{self.id}");
-            var face = evaluateQuery(context, qCreatedBy(feature_id, EntityType.FACE))[0];
-            return transientQueriesToStrings(face);
+        """
+        if self._transient_id is None:
+            self._transient_id = self._load_transient_id()
+        return self._transient_id
 
-        }}
-            """,
-        )
+    def _load_transient_id(self) -> str:
+        """Load the transient id of the plane's face.
+
+        Returns:
+            The transient ID
+
+        """
+        script = _OFFSET_PLANE_SCRIPT.format(feature_id=self.id)
 
         response = self._client._api.endpoints.eval_featurescript(
             document_id=self.document.id,
@@ -232,28 +297,28 @@ class OffsetPlane(Plane):
 
     @override
     def _to_model(self) -> schema.Plane:
-        return schema.Plane(
+        return schema.Plane.model_construct(
             name=self.name,
             parameters=[
                 {
-                    "btType": "BTMParameterQueryList-148",
+                    "btType": schema.BT_PARAMETER_QUERY_LIST,
                     "queries": [
                         {
-                            "btType": "BTMIndividualQuery-138",
-                            "deterministicIds": self._get_owner_transient_ids(),
+                            "btType": schema.BT_INDIVIDUAL_QUERY,
+                            "deterministicIds": self._owner_ids,
                         },
                     ],
                     "parameterId": "entities",
                 },
                 {
-                    "btType": "BTMParameterEnum-145",
+                    "btType": schema.BT_PARAMETER_ENUM,
                     "namespace": "",
                     "enumName": "CPlaneType",
                     "value": "OFFSET",
                     "parameterId": "cplaneType",
                 },
                 {
-                    "btType": "BTMParameterQuantity-147",
+                    "btType": schema.BT_PARAMETER_QUANTITY,
                     "isInteger": False,
                     "value": 0,
                     "units": "",
@@ -261,7 +326,7 @@ class OffsetPlane(Plane):
                     "parameterId": "offset",
                 },
                 {
-                    "btType": "BTMParameterBoolean-144",
+                    "btType": schema.BT_PARAMETER_BOOLEAN,
                     "value": self.distance < 0,
                     "nodeId": "MMaw54aRdL0c7OmQp",
                     "parameterId": "oppositeDirection",
@@ -8,33 +8,61 @@ OnPy - May 2024 - Kyle Tennison
 """
 
 import copy
+import itertools
 import math
 from collections.abc import Sequence
-from textwrap import dedent
 from typing import TYPE_CHECKING, override
 
-import numpy as np
 from loguru import logger
 
 from onpy.api import schema
-from onpy.api.versioning import WorkspaceWVM
-from onpy.entities import EdgeEntity, Entity, EntityFilter, FaceEntity, VertexEntity
+from onpy.entities import EdgeEntity, EntityFilter, FaceEntity, VertexEntity
 from onpy.entities.protocols import FaceEntityConvertible
 from onpy.features.base import Feature
 from onpy.features.sketch.sketch_items import (
+    Affine2D,
     SketchArc,
     SketchCircle,
     SketchItem,
     SketchLine,
+    _gather_points,
+    _mirror_matrix,
+    _mirror_points_np,
+    _rotate_points_np,
+    _rotation_matrix,
+    _scatter_points,
+    _translate_points_np,
 )
 from onpy.util.exceptions import OnPyFeatureError
-from onpy.util.misc import Point2D, UnitSystem, unwrap
+from onpy.util.misc import RADIANS_PER_DEGREE, Point2D, UnitSystem, unwrap
 
 if TYPE_CHECKING:
     from onpy.elements.partstudio import PartStudio
     from onpy.features.planes import Plane
 
 
+# the query for every entity on a sketch, left to the server to evaluate
+_SKETCH_ENTITIES_QUERY = 'qCreatedBy(makeId("{feature_id}"))'
+
+
+def _project_onto_line(point: Point2D, origin: Point2D, angle: float) -> Point2D:
+    """Find the closest point on a line to another point.
+
+    Args:
+        point: The point to project
+        origin: Any point on the line
+        angle: The angle of the line, relative to the x-axis, in radians
+
+    Returns:
+        The projected point
+
+    """
+    cos = math.cos(angle)
+    sin = math.sin(angle)
+    t = (point.x - origin.x) * cos + (point.y - origin.y) * sin
+    return Point2D(cos * t + origin.x, sin * t + origin.y)
+
+
 class Sketch(Feature, FaceEntityConvertible):
     """The OnShape Sketch Feature, used to build 2D geometries."""
 
@@ -57,6 +85,7 @@ class Sketch(Feature, FaceEntityConvertible):
         self._name = name
         self._id: str | None = None
         self._items: set[SketchItem] = set()
+        self._meters_per_unit = self._client.units.meters_per_unit
 
         self._upload_feature()
 
@@ -80,6 +109,20 @@ class Sketch(Feature, FaceEntityConvertible):
         """A list of items that were added to the sketch."""
         return list(self._items)
 
+    def _to_sketch_point(self, pair: tuple[float, float]) -> Point2D:
+        """Convert an ordered pair in the client's units into a sketch point,
+        which is always metric.
+
+        Args:
+            pair: The (x,y) pair to convert
+
+        Returns:
+            The point in meters
+
+        """
+        scale = self._meters_per_unit
+        return Point2D(pair[0] * scale, pair[1] * scale)
+
     def add_circle(
         self,
         center: tuple[float, float],
@@ -94,14 +137,12 @@ class Sketch(Feature, FaceEntityConvertible):
             units: An optional other unit system to use
 
         """
-        center_point = Point2D.from_pair(center)
-
         units = units if units else self._client.units
 
         # API expects metric values
-        if units is UnitSystem.INCH:
-            center_point *= 0.0254
-            radius *= 0.0254
+        scale = units.meters_per_unit
+        center_point = Point2D(center[0] * scale, center[1] * scale)
+        radius *= scale
 
         item = SketchCircle(
             sketch=self,
@@ -110,7 +151,7 @@ class Sketch(Feature, FaceEntityConvertible):
             units=self._client.units,
         )
 
-        logger.info(f"Added circle to sketch: {item}")
+        logger.debug("Added circle to sketch: {}", item)
         self._items.add(item)
         self._update_feature()
 
@@ -128,19 +169,29 @@ class Sketch(Feature, FaceEntityConvertible):
             end: The ending point of the line
 
         """
-        start_point = Point2D.from_pair(start)
-        end_point = Point2D.from_pair(end)
+        item = self._add_sketch_line(
+            self._to_sketch_point(start),
+            self._to_sketch_point(end),
+        )
+        self._update_feature()
+        return item
 
-        if self._client.units is UnitSystem.INCH:
-            start_point *= 0.0254
-            end_point *= 0.0254
+    def _add_sketch_line(self, start: Point2D, end: Point2D) -> SketchLine:
+        """Add a line between two sketch points without updating the feature.
 
-        item = SketchLine(self, start_point, end_point, self._client.units)
+        Args:
+            start: The starting point of the line, in meters
+            end: The ending point of the line, in meters
 
-        logger.info(f"Added line to sketch: {item}")
+        Returns:
+            The added line
+
+        """
+        item = SketchLine(self, start, end, self._client.units)
+
+        logger.debug("Added line to sketch: {}", item)
 
         self._items.add(item)
-        self._update_feature()
         return item
 
     def trace_points(
@@ -150,30 +201,26 @@ class Sketch(Feature, FaceEntityConvertible):
     ) -> list[SketchLine]:
         """Traces a series of points.
 
+        The sketch is only updated once, after every line has been added.
+
         Args:
             points: A list of points to trace. Uses list order for line
             end_connect: Connects end points of the trace with an extra segment
                 to create a closed loop. Defaults to True.
 
         """
-        segments: list[tuple[Point2D, Point2D]] = []
+        # each point starts one segment and ends another, so only convert
+        # them once
+        sketch_points = [self._to_sketch_point(p) for p in points]
 
-        for idx in range(1, len(points)):
-
-            p1 = Point2D.from_pair(points[idx - 1])
-            p2 = Point2D.from_pair(points[idx])
-
-            segments.append((p1, p2))
+        segments = list(itertools.pairwise(sketch_points))
 
         if end_connect:
-            segments.append(
-                (Point2D.from_pair(points[0]), Point2D.from_pair(points[-1])),
-            )
+            segments.append((sketch_points[0], sketch_points[-1]))
 
-        lines = []
-
-        for p1, p2 in segments:
-            lines.append(self.add_line(p1.as_tuple, p2.as_tuple))
+        # add every line before updating, so the trace is a single upload
+        lines = [self._add_sketch_line(p1, p2) for p1, p2 in segments]
+        self._update_feature()
 
         return lines
 
@@ -189,10 +236,10 @@ class Sketch(Feature, FaceEntityConvertible):
             corner_2: The point of the corner opposite to corner 1
 
         """
-        p1 = Point2D.from_pair(corner_1)
-        p2 = Point2D.from_pair(corner_2)
+        x1, y1 = corner_1
+        x2, y2 = corner_2
 
-        self.trace_points((p1.x, p1.y), (p2.x, p1.y), (p2.x, p2.y), (p1.x, p2.y))
+        self.trace_points((x1, y1), (x2, y1), (x2, y2), (x1, y2))
 
     def add_centerpoint_arc(
         self,
@@ -210,22 +257,22 @@ class Sketch(Feature, FaceEntityConvertible):
             end_angle: The angle to stop drawing the arc at
 
         """
-        center = Point2D.from_pair(centerpoint)
-
-        if self._client.units is UnitSystem.INCH:
-            radius *= 0.0254
-            center *= 0.0254
+        center = self._to_sketch_point(centerpoint)
+        radius *= self._meters_per_unit
 
         item = SketchArc(
             sketch=self,
             radius=radius,
             center=center,
-            theta_interval=(math.radians(start_angle), math.radians(end_angle)),
+            theta_interval=(
+                start_angle * RADIANS_PER_DEGREE,
+                end_angle * RADIANS_PER_DEGREE,
+            ),
             units=self._client.units,
         )
 
         self._items.add(item)
-        logger.info("Successfully added arc to sketch")
+        logger.debug("Successfully added arc to sketch")
         self._update_feature()
         return item
 
@@ -251,8 +298,7 @@ class Sketch(Feature, FaceEntityConvertible):
             msg = "Cannot create a fillet between the same line"
             raise OnPyFeatureError(msg)
 
-        if self._client.units is UnitSystem.INCH:
-            radius *= 0.0254
+        radius *= self._meters_per_unit
 
         if Point2D.approx(line_1.start, line_2.start):
             line_1.start = line_2.start
@@ -279,20 +325,19 @@ class Sketch(Feature, FaceEntityConvertible):
             raise OnPyFeatureError(msg)
 
         # draw a triangle to find the angle between the two lines using law of cosines
-        a = math.sqrt((vertex_1.x - center.x) ** 2 + (vertex_1.y - center.y) ** 2)
-        b = math.sqrt((vertex_2.x - center.x) ** 2 + (vertex_2.y - center.y) ** 2)
-        c = math.sqrt((vertex_1.x - vertex_2.x) ** 2 + (vertex_1.y - vertex_2.y) ** 2)
+        a = math.hypot(vertex_1.x - center.x, vertex_1.y - center.y)
+        b = math.hypot(vertex_2.x - center.x, vertex_2.y - center.y)
+        c = math.hypot(vertex_1.x - vertex_2.x, vertex_1.y - vertex_2.y)
 
-        opening_angle = math.acos((a**2 + b**2 - c**2) / (2 * a * b))
+        opening_angle = math.acos((a * a + b * b - c * c) / (2 * a * b))
 
         # find the vector that is between the two lines
-        line_1_vec = np.array(((vertex_1.x - center.x), (vertex_1.y - center.y)))
-        line_2_vec = np.array(((vertex_2.x - center.x), (vertex_2.y - center.y)))
-
-        line_1_angle = math.atan2(line_1_vec[1], line_1_vec[0]) % (math.pi * 2)
-        line_2_angle = math.atan2(line_2_vec[1], line_2_vec[0]) % (math.pi * 2)
+        line_1_angle = math.atan2(vertex_1.y - center.y, vertex_1.x - center.x)
+        line_2_angle = math.atan2(vertex_2.y - center.y, vertex_2.x - center.x)
+        line_1_angle %= math.pi * 2
+        line_2_angle %= math.pi * 2
 
-        center_angle = np.average((line_1_angle, line_2_angle))  # relative to x-axis
+        center_angle = (line_1_angle + line_2_angle) / 2  # relative to x-axis
 
         # find the distance of the fillet centerpoint from the intersection point
         arc_center_offset = radius / math.sin(opening_angle / 2)
@@ -305,19 +350,15 @@ class Sketch(Feature, FaceEntityConvertible):
         arc_center = line_dir * arc_center_offset + center  # make an initial guess
 
         # find the closest point to the line
-        t = (arc_center.x - line_1.start.x) * math.cos(line_1_angle) + (
-            arc_center.y - line_1.start.y
-        ) * math.sin(line_1_angle)
-        line_1_tangent_point = Point2D(
-            math.cos(line_1_angle) * t + line_1.start.x,
-            math.sin(line_1_angle) * t + line_1.start.y,
+        line_1_tangent_point = _project_onto_line(
+            arc_center,
+            line_1.start,
+            line_1_angle,
         )
-        t = (arc_center.x - line_2.start.x) * math.cos(line_2_angle) + (
-            arc_center.y - line_2.start.y
-        ) * math.sin(line_2_angle)
-        line_2_tangent_point = Point2D(
-            math.cos(line_2_angle) * t + line_2.start.x,
-            math.sin(line_2_angle) * t + line_2.start.y,
+        line_2_tangent_point = _project_onto_line(
+            arc_center,
+            line_2.start,
+            line_2_angle,
         )
 
         # check to see if distance increased or decreased
@@ -342,19 +383,15 @@ class Sketch(Feature, FaceEntityConvertible):
         # Check if lines got bigger
         if line_1_copy.length > line_1.length or line_2_copy.length > line_2.length:
             arc_center = line_dir * -arc_center_offset + center  # make an initial guess
-            t = (arc_center.x - line_1.start.x) * math.cos(line_1_angle) + (
-                arc_center.y - line_1.start.y
-            ) * math.sin(line_1_angle)
-            line_1_tangent_point = Point2D(
-                math.cos(line_1_angle) * t + line_1.start.x,
-                math.sin(line_1_angle) * t + line_1.start.y,
+            line_1_tangent_point = _project_onto_line(
+                arc_center,
+                line_1.start,
+                line_1_angle,
             )
-            t = (arc_center.x - line_2.start.x) * math.cos(line_2_angle) + (
-                arc_center.y - line_2.start.y
-            ) * math.sin(line_2_angle)
-            line_2_tangent_point = Point2D(
-                math.cos(line_2_angle) * t + line_2.start.x,
-                math.sin(line_2_angle) * t + line_2.start.y,
+            line_2_tangent_point = _project_onto_line(
+                arc_center,
+                line_2.start,
+                line_2_angle,
             )
 
         # Shorten lines
@@ -394,22 +431,22 @@ class Sketch(Feature, FaceEntityConvertible):
         else:
             transient_ids = [self.plane.transient_id]
 
-        return schema.Sketch(
+        return schema.Sketch.model_construct(
             name=self.name,
             featureId=self._id,
             suppressed=False,
             parameters=[
-                schema.FeatureParameterQueryList(
+                schema.FeatureParameterQueryList.model_construct(
                     queries=[
                         {
-                            "btType": "BTMIndividualQuery-138",
+                            "btType": schema.BT_INDIVIDUAL_QUERY,
                             "deterministicIds": transient_ids,
                         },
                     ],
                     parameterId="sketchPlane",
                 ).model_dump(exclude_none=True),
                 {
-                    "btType": "BTMParameterBoolean-144",
+                    "btType": schema.BT_PARAMETER_BOOLEAN,
                     "value": True,
                     "parameterId": "disableImprinting",
                 },
@@ -427,37 +464,18 @@ class Sketch(Feature, FaceEntityConvertible):
     def entities(self) -> EntityFilter:
         """All of the entities on this sketch.
 
+        The filter is built from the sketch's query rather than its transient
+        ids, so it is only evaluated with whatever query is applied to it.
+
         Returns:
             An EntityFilter object used to query entities
 
         """
-        script = dedent(
-            f"""
-            function(context is Context, queries) {{
-                var feature_id = makeId("{self.id}");
-                var faces = evaluateQuery(context, qCreatedBy(feature_id));
-                return transientQueriesToStrings(faces);
-            }}
-            """,
-        )
-
-        response = self._client._api.endpoints.eval_featurescript(
-            document_id=self._partstudio.document.id,
-            version=WorkspaceWVM(self._partstudio.document.default_workspace.id),
-            element_id=self._partstudio.id,
-            script=script,
-            return_type=schema.FeaturescriptResponse,
+        return EntityFilter._from_expression(
+            self.partstudio,
+            _SKETCH_ENTITIES_QUERY.format(feature_id=self.id),
         )
 
-        transient_ids_raw = unwrap(
-            response.result,
-            message="Featurescript failed get entities owned by part",
-        )["value"]
-
-        entities = [Entity(i["value"]) for i in transient_ids_raw]
-
-        return EntityFilter(partstudio=self.partstudio, available=entities)
-
     @override
     def _face_entities(self) -> list[FaceEntity]:
         return self.faces._available
@@ -465,26 +483,17 @@ class Sketch(Feature, FaceEntityConvertible):
     @property
     def vertices(self) -> EntityFilter[VertexEntity]:
         """An object used for interfacing with vertex entities on this sketch."""
-        return EntityFilter(
-            partstudio=self._partstudio,
-            available=self.entities.is_type(VertexEntity)._available,
-        )
+        return self.entities.is_type(VertexEntity)
 
     @property
     def edges(self) -> EntityFilter[EdgeEntity]:
         """An object used for interfacing with edge entities on this sketch."""
-        return EntityFilter(
-            partstudio=self._partstudio,
-            available=self.entities.is_type(EdgeEntity)._available,
-        )
+        return self.entities.is_type(EdgeEntity)
 
     @property
     def faces(self) -> EntityFilter[FaceEntity]:
         """An object used for interfacing with face entities on this sketch."""
-        return EntityFilter(
-            partstudio=self._partstudio,
-            available=self.entities.is_type(FaceEntity)._available,
-        )
+        return self.entities.is_type(FaceEntity)
 
     def mirror[
         T: SketchItem
@@ -512,7 +521,9 @@ class Sketch(Feature, FaceEntityConvertible):
         if copy:
             items = tuple([i.clone() for i in items])
 
-        return [i.mirror(line_point, line_dir) for i in items]
+        line_end = (line_point[0] + line_dir[0], line_point[1] + line_dir[1])
+
+        return [i.mirror(line_point, line_end) for i in items]
 
     def rotate[
         T: SketchItem
@@ -570,6 +581,178 @@ class Sketch(Feature, FaceEntityConvertible):
 
         return [i.translate(x, y) for i in items]
 
+    def affine_rotate(self, origin: tuple[float, float], theta: float) -> Affine2D:
+        """Build a rotation for use with `SketchItem.compose`.
+
+        Args:
+            origin: The point to rotate about
+            theta: The degrees to rotate by. Positive is ccw
+
+        Returns:
+            The rotation as an affine transform
+
+        """
+        return _rotation_matrix(
+            self._to_sketch_point(origin),
+            theta * RADIANS_PER_DEGREE,
+        )
+
+    def affine_translate(self, x: float = 0, y: float = 0) -> Affine2D:
+        """Build a translation for use with `SketchItem.compose`.
+
+        Args:
+            x: The distance to translate along the x-axis
+            y: The distance to translate along the y-axis
+
+        Returns:
+            The translation as an affine transform
+
+        """
+        offset = self._to_sketch_point((x, y))
+        return (1.0, 0.0, 0.0, 1.0, offset.x, offset.y)
+
+    def affine_mirror(
+        self,
+        line_start: tuple[float, float],
+        line_end: tuple[float, float],
+    ) -> Affine2D:
+        """Build a mirror for use with `SketchItem.compose`.
+
+        Args:
+            line_start: The starting point of the mirror line
+            line_end: The ending point of the mirror line
+
+        Returns:
+            The mirror as an affine transform
+
+        """
+        return _mirror_matrix(
+            self._to_sketch_point(line_start),
+            self._to_sketch_point(line_end),
+        )
+
+    def bulk_mirror[
+        T: SketchItem
+    ](
+        self,
+        items: Sequence[T],
+        line_point: tuple[float, float],
+        line_dir: tuple[float, float],
+        *,
+        copy: bool = False,
+    ) -> list[T]:
+        """Mirrors many sketch items about a line in a single vectorized pass.
+
+        Unlike `mirror`, the items are modified in place and the sketch is
+        only updated once, which is much faster for large selections.
+
+        Args:
+            items: Any number of sketch items to mirror
+            line_point: Any point that lies on the mirror line
+            line_dir: The direction of the mirror line
+            copy: Whether or not to save a copy of the original entity. Defaults
+                to False.
+
+        Returns:
+            A list of the mirrored items
+
+        """
+        if copy:
+            items = tuple([i.clone() for i in items])
+
+        line_start = self._to_sketch_point(line_point)
+        line_end = line_start + Point2D.from_pair(line_dir)
+
+        xs, ys = _gather_points(items)
+        _scatter_points(items, *_mirror_points_np(xs, ys, line_start, line_end))
+
+        line_angle = math.atan2(line_dir[1], line_dir[0])
+        for item in items:
+            item._mirror_angles(line_angle)
+
+        self._update_feature()
+        return list(items)
+
+    def bulk_rotate[
+        T: SketchItem
+    ](
+        self,
+        items: Sequence[T],
+        origin: tuple[float, float],
+        theta: float,
+        *,
+        copy: bool = False,
+    ) -> list[T]:
+        """Rotates many sketch items about a point in a single vectorized pass.
+
+        Unlike `rotate`, the items are modified in place and the sketch is
+        only updated once, which is much faster for large selections.
+
+        Args:
+            items: Any number of sketch items to rotate
+            origin: The point to pivot about
+            theta: The degrees to rotate by
+            copy: Whether or not to save a copy of the original entity. Defaults
+                to False.
+
+        Returns:
+            A list of the rotated items
+
+        """
+        if copy:
+            items = tuple([i.clone() for i in items])
+
+        radians = theta * RADIANS_PER_DEGREE
+
+        xs, ys = _gather_points(items)
+        _scatter_points(
+            items,
+            *_rotate_points_np(xs, ys, self._to_sketch_point(origin), radians),
+        )
+
+        for item in items:
+            item._rotate_angles(radians)
+
+        self._update_feature()
+        return list(items)
+
+    def bulk_translate[
+        T: SketchItem
+    ](
+        self,
+        items: Sequence[T],
+        x: float = 0,
+        y: float = 0,
+        *,
+        copy: bool = False,
+    ) -> list[T]:
+        """Translate many sketch items in a single vectorized pass.
+
+        Unlike `translate`, the items are modified in place and the sketch is
+        only updated once, which is much faster for large selections.
+
+        Args:
+            items: Any number of sketch items to translate
+            x: The amount to translate in the x-axis
+            y: The amount to translate in the y-axis
+            copy: Whether or not to save a copy of the original entity. Defaults
+                to False.
+
+        Returns:
+            A list of the translated items
+
+        """
+        if copy:
+            items = tuple([i.clone() for i in items])
+
+        offset = self._to_sketch_point((x, y))
+
+        xs, ys = _gather_points(items)
+        _scatter_points(items, *_translate_points_np(xs, ys, offset.x, offset.y))
+
+        self._update_feature()
+        return list(items)
+
     def circular_pattern[
         T: SketchItem
     ](
@@ -11,9 +11,11 @@ OnPy - May 2024 - Kyle Tennison
 """
 
 import copy
+import functools
 import math
 import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Self, override
 
 import numpy as np
@@ -21,17 +23,120 @@ from loguru import logger
 
 from onpy.api import schema
 from onpy.util.exceptions import OnPyParameterError
-from onpy.util.misc import Point2D, UnitSystem
+from onpy.util.misc import RADIANS_PER_DEGREE, Point2D, UnitSystem
 
 if TYPE_CHECKING:
     from onpy.features import Sketch
 
 
+type Affine2D = tuple[float, float, float, float, float, float]
+"""A 2D affine transform (a, b, c, d, tx, ty), mapping (x, y) to
+(a*x + b*y + tx, c*x + d*y + ty). Lengths are in meters."""
+
+
+@functools.lru_cache(maxsize=64)
+def _cos_sin(radians: float) -> tuple[float, float]:
+    """Get the cosine and sine of an angle. Cached because patterns and bulk
+    transforms rotate many points by the same few angles.
+
+    Args:
+        radians: The angle, in radians
+
+    Returns:
+        A (cos, sin) pair
+
+    """
+    return math.cos(radians), math.sin(radians)
+
+
+def _mirror_matrix(line_start: Point2D, line_end: Point2D) -> Affine2D:
+    """Get the affine transform that reflects points across a line.
+
+    Args:
+        line_start: The point where the line starts
+        line_end: The point where the line ends
+
+    Returns:
+        The (a, b, c, d, tx, ty) transform mapping (x, y) to
+        (a*x + b*y + tx, c*x + d*y + ty)
+
+    """
+    ux = line_end.x - line_start.x
+    uy = line_end.y - line_start.y
+    length_sq = ux * ux + uy * uy
+
+    # reflection across a line through the origin, parallel to the mirror line
+    a = (ux * ux - uy * uy) / length_sq
+    b = 2 * ux * uy / length_sq
+
+    return (
+        a,
+        b,
+        b,
+        -a,
+        line_start.x - a * line_start.x - b * line_start.y,
+        line_start.y - b * line_start.x + a * line_start.y,
+    )
+
+
+def _rotation_matrix(pivot: Point2D, radians: float) -> Affine2D:
+    """Get the affine transform that rotates points about a pivot.
+
+    Args:
+        pivot: The point to rotate about
+        radians: The radians to rotate by. Positive is ccw
+
+    Returns:
+        The rotation as an affine transform
+
+    """
+    cos_t, sin_t = _cos_sin(radians)
+
+    return (
+        cos_t,
+        -sin_t,
+        sin_t,
+        cos_t,
+        pivot.x - cos_t * pivot.x + sin_t * pivot.y,
+        pivot.y - sin_t * pivot.x - cos_t * pivot.y,
+    )
+
+
+def _compose_affine(first: Affine2D, second: Affine2D) -> Affine2D:
+    """Combine two affine transforms into one.
+
+    Args:
+        first: The transform to apply first
+        second: The transform to apply second
+
+    Returns:
+        A transform equivalent to applying `first`, then `second`
+
+    """
+    a1, b1, c1, d1, tx1, ty1 = first
+    a2, b2, c2, d2, tx2, ty2 = second
+
+    return (
+        a2 * a1 + b2 * c1,
+        a2 * b1 + b2 * d1,
+        c2 * a1 + d2 * c1,
+        c2 * b1 + d2 * d1,
+        a2 * tx1 + b2 * ty1 + tx2,
+        c2 * tx1 + d2 * ty1 + ty2,
+    )
+
+
+_IDENTITY_AFFINE: Affine2D = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
 class SketchItem(ABC):
     """Represents an item that the user added to the sketch. *Not* the same
     as an entity.
     """
 
+    # the id of the item's entity in the sketch feature
+    entity_id: str
+
     @property
     @abstractmethod
     def sketch(self) -> "Sketch":
@@ -43,15 +148,16 @@ class SketchItem(ABC):
         ...
 
     @abstractmethod
-    def translate(self, x: float = 0, y: float = 0) -> Self:
+    def translate(self, x: float = 0, y: float = 0, *, inplace: bool = False) -> Self:
         """Linear translation of the entity.
 
         Args:
             x: The distance to translate along the x-axis
             y: The distance to translate along the y-axis
+            inplace: Move this entity instead of replacing it with a new one
 
         Returns:
-            A new sketch object
+            A new sketch object, or this one if `inplace` is set
 
         """
         ...
@@ -105,45 +211,76 @@ class SketchItem(ABC):
             The mirrored point
 
         """
-        q_i = np.array(line_start.as_tuple)
-        q_j = np.array(line_end.as_tuple)
-        p_0 = np.array(point.as_tuple)
+        return SketchItem._mirror_point_precomp(
+            point,
+            _mirror_matrix(line_start, line_end),
+        )
 
-        a = q_i[1] - q_j[1]
-        b = q_j[0] - q_i[0]
-        c = -(a * q_i[0] + b * q_i[1])
+    @staticmethod
+    def _mirror_point_precomp(
+        point: Point2D,
+        matrix: Affine2D,
+    ) -> Point2D:
+        """Mirrors the point using a reflection from `_mirror_matrix`, so that
+        many points can share the same mirror line setup.
 
-        p_k = (
-            np.array([[b**2 - a**2, -2 * a * b], [-2 * a * b, a**2 - b**2]]) @ p_0
-            - 2 * c * np.array([a, b])
-        ) / (a**2 + b**2)
+        Args:
+            point: The point to mirror
+            matrix: The (a, b, c, d, tx, ty) affine reflection
 
-        return Point2D.from_pair(p_k)
+        Returns:
+            The mirrored point
+
+        """
+        a, b, c, d, tx, ty = matrix
+        return Point2D(
+            a * point.x + b * point.y + tx,
+            c * point.x + d * point.y + ty,
+        )
 
     @staticmethod
-    def _rotate_point(point: Point2D, pivot: Point2D, degrees: float) -> Point2D:
+    def _rotate_point(point: Point2D, pivot: Point2D, radians: float) -> Point2D:
         """Rotates a point about another point.
 
         Args:
             point: The point to rotate
             pivot: The pivot to rotate about
-            degrees: The degrees to rotate by
+            radians: The radians to rotate by
 
         Returns:
             The rotated point
 
         """
-        dx = point.x - pivot.x
-        dy = point.y - pivot.y
+        cos_t, sin_t = _cos_sin(radians)
+        return SketchItem._rotate_point_precomp(point, pivot, cos_t, sin_t)
+
+    @staticmethod
+    def _rotate_point_precomp(
+        point: Point2D,
+        pivot: Point2D,
+        cos_t: float,
+        sin_t: float,
+    ) -> Point2D:
+        """Rotates a point about another point using a precomputed cosine and
+        sine, so that many points can share the same trig calls.
 
-        radius = math.sqrt(dx**2 + dy**2)
-        start_angle = math.atan2(dy, dx)
-        end_angle = start_angle + math.radians(degrees)
+        Args:
+            point: The point to rotate
+            pivot: The pivot to rotate about
+            cos_t: The cosine of the rotation angle
+            sin_t: The sine of the rotation angle
 
-        new_x = radius * math.cos(end_angle)
-        new_y = radius * math.sin(end_angle)
+        Returns:
+            The rotated point
 
-        return Point2D(new_x, new_y)
+        """
+        dx = point.x - pivot.x
+        dy = point.y - pivot.y
+
+        return Point2D(
+            cos_t * dx - sin_t * dy + pivot.x,
+            sin_t * dx + cos_t * dy + pivot.y,
+        )
 
     def _replace_entity(self, new_entity: "SketchItem") -> None:
         """Replace the existing entity with a new entity and refreshes the
@@ -157,14 +294,135 @@ class SketchItem(ABC):
         self.sketch._items.add(new_entity)
         self.sketch._update_feature()
 
+    def _translate_inplace(self, x: float, y: float) -> Self:
+        """Shift the entity's control points and refresh the feature, without
+        allocating a replacement entity.
+
+        Args:
+            x: The x distance to translate by, in sketch units (meters)
+            y: The y distance to translate by, in sketch units (meters)
+
+        Returns:
+            This entity
+
+        """
+        self._load_control_points(
+            [Point2D(p.x + x, p.y + y) for p in self._control_points()],
+        )
+        self.sketch._update_feature()
+        return self
+
+    @abstractmethod
+    def _control_points(self) -> list[Point2D]:
+        """Get the points that locate the item in the sketch plane. Used by
+        the bulk transforms in Sketch.
+        """
+        ...
+
+    @abstractmethod
+    def _load_control_points(self, points: Sequence[Point2D]) -> None:
+        """Move the item onto a new set of control points, in the same
+        order as they were given by `_control_points`.
+        """
+        ...
+
+    def _rotate_angles(self, theta: float) -> None:  # noqa: B027
+        """Update any angular parameters after a bulk rotation.
+
+        Args:
+            theta: The radians that the item was rotated by
+
+        """
+
+    def _mirror_angles(self, line_angle: float) -> None:  # noqa: B027
+        """Update any angular parameters after a bulk mirror.
+
+        Args:
+            line_angle: The angle of the mirror line, in radians
+
+        """
+
+    def apply_affine(self, matrix: Affine2D) -> Self:
+        """Apply a rigid affine transform to the entity in a single step.
+
+        Args:
+            matrix: A transform built by Sketch.affine_rotate, affine_translate,
+                affine_mirror, or a composition of them
+
+        Returns:
+            A new sketch object
+
+        Raises:
+            OnPyParameterError if the transform scales or shears
+
+        """
+        a, b, c, d, tx, ty = matrix
+
+        if not (
+            math.isclose(a * a + c * c, 1)
+            and math.isclose(b * b + d * d, 1)
+            and math.isclose(a * b + c * d, 0, abs_tol=1e-9)
+        ):
+            msg = "Only rotations, translations, and mirrors can be applied"
+            raise OnPyParameterError(msg)
+
+        new_entity = self._clone_with()
+        new_entity._load_control_points(
+            [
+                Point2D(a * p.x + b * p.y + tx, c * p.x + d * p.y + ty)
+                for p in self._control_points()
+            ],
+        )
+
+        if a * d - b * c > 0:
+            new_entity._rotate_angles(math.atan2(c, a))
+        else:
+            new_entity._mirror_angles(math.atan2(c, a) / 2)
+
+        self._replace_entity(new_entity)
+        return new_entity
+
+    def compose(self, *matrices: Affine2D) -> Self:
+        """Apply several transforms, in order, as one combined transform. The
+        entity is only replaced once, no matter how many transforms are given.
+
+        Args:
+            matrices: The transforms to apply, first to last
+
+        Returns:
+            A new sketch object
+
+        """
+        return self.apply_affine(
+            functools.reduce(_compose_affine, matrices, _IDENTITY_AFFINE),
+        )
+
     def clone(self) -> Self:
         """Create a copy of the entity."""
         logger.debug(f"Created a close of {self}")
 
-        new_entity = copy.copy(self)
+        new_entity = self._clone_with()
         self.sketch._items.add(new_entity)
         return new_entity
 
+    def _clone_with(self, **changes: object) -> Self:
+        """Shallow-copy the entity under a new id, overriding some attributes.
+        Used by the transforms so that unchanged fields aren't re-passed
+        through the constructor.
+
+        Args:
+            changes: The attributes to set on the copy
+
+        Returns:
+            The new entity. It is not added to the sketch
+
+        """
+        new_entity = copy.copy(self)
+        for attr, value in changes.items():
+            setattr(new_entity, attr, value)
+        new_entity.entity_id = self._generate_entity_id()
+        return new_entity
+
     def linear_pattern(
         self,
         num_steps: int,
@@ -242,7 +500,7 @@ class SketchCircle(SketchItem):
         radius: float,
         center: Point2D,
         units: UnitSystem,
-        direction: tuple[float, float] = (1, 0),
+        direction: tuple[float, float] | Point2D = (1, 0),
         *,
         clockwise: bool = False,
     ) -> None:
@@ -259,16 +517,20 @@ class SketchCircle(SketchItem):
         self.radius = radius
         self.center = center
         self.units = units
-        self.direction = Point2D.from_pair(direction)
+        self.direction = (
+            direction
+            if isinstance(direction, Point2D)
+            else Point2D.from_pair(direction)
+        )
         self.clockwise = clockwise
         self.entity_id = self._generate_entity_id()
 
     @override
     def to_model(self) -> schema.SketchCurveEntity:
 
-        return schema.SketchCurveEntity(
+        return schema.SketchCurveEntity.model_construct(
             geometry={
-                "btType": "BTCurveGeometryCircle-115",
+                "btType": schema.BT_CURVE_GEOMETRY_CIRCLE,
                 "radius": self.radius,
                 "xcenter": self.center.x,
                 "ycenter": self.center.y,
@@ -286,36 +548,42 @@ class SketchCircle(SketchItem):
         """A reference to the owning sketch."""
         return self._sketch
 
+    @override
+    def _control_points(self) -> list[Point2D]:
+        return [self.center]
+
+    @override
+    def _load_control_points(self, points: Sequence[Point2D]) -> None:
+        (self.center,) = points
+
     @override
     def rotate(self, origin: tuple[float, float], theta: float) -> "SketchCircle":
-        new_center = self._rotate_point(self.center, Point2D.from_pair(origin), theta)
-        new_entity = SketchCircle(
-            sketch=self.sketch,
-            radius=self.radius,
-            center=new_center,
-            units=self.units,
-            direction=self.direction.as_tuple,
-            clockwise=self.clockwise,
+        new_center = self._rotate_point(
+            self.center,
+            self._sketch._to_sketch_point(origin),
+            theta * RADIANS_PER_DEGREE,
         )
+        new_entity = self._clone_with(center=new_center)
         self._replace_entity(new_entity)
         return new_entity
 
     @override
-    def translate(self, x: float = 0, y: float = 0) -> "SketchCircle":
+    def translate(
+        self,
+        x: float = 0,
+        y: float = 0,
+        *,
+        inplace: bool = False,
+    ) -> "SketchCircle":
 
-        if self._sketch._client.units is UnitSystem.INCH:
-            x *= 0.0254
-            y *= 0.0254
+        x *= self._sketch._meters_per_unit
+        y *= self._sketch._meters_per_unit
+
+        if inplace:
+            return self._translate_inplace(x, y)
 
         new_center = Point2D(self.center.x + x, self.center.y + y)
-        new_entity = SketchCircle(
-            sketch=self.sketch,
-            radius=self.radius,
-            center=new_center,
-            units=self.units,
-            direction=self.direction.as_tuple,
-            clockwise=self.clockwise,
-        )
+        new_entity = self._clone_with(center=new_center)
         self._replace_entity(new_entity)
         return new_entity
 
@@ -325,8 +593,8 @@ class SketchCircle(SketchItem):
         line_start: tuple[float, float],
         line_end: tuple[float, float],
     ) -> "SketchCircle":
-        mirror_start = Point2D.from_pair(line_start)
-        mirror_end = Point2D.from_pair(line_end)
+        mirror_start = self._sketch._to_sketch_point(line_start)
+        mirror_end = self._sketch._to_sketch_point(line_end)
 
         # to avoid confusion
         del line_start
@@ -334,14 +602,7 @@ class SketchCircle(SketchItem):
 
         new_center = self._mirror_point(self.center, mirror_start, mirror_end)
 
-        new_entity = SketchCircle(
-            sketch=self.sketch,
-            radius=self.radius,
-            center=new_center,
-            units=self.units,
-            direction=self.direction.as_tuple,
-            clockwise=self.clockwise,
-        )
+        new_entity = self._clone_with(center=new_center)
 
         self._replace_entity(new_entity)
         return new_entity
@@ -369,35 +630,65 @@ class SketchLine(SketchItem):
 
         """
         self._sketch = sketch
-        self.start = start_point
-        self.end = end_point
+        self._start = start_point
+        self._end = end_point
         self.units = units
         self.entity_id = self._generate_entity_id()
 
+    _DERIVED_ATTRS = ("dx", "dy", "length", "theta", "direction")
+
+    def _invalidate_derived(self) -> None:
+        """Drop the cached geometry derived from the line's endpoints."""
+        for attr in self._DERIVED_ATTRS:
+            self.__dict__.pop(attr, None)
+
+    @property
+    def start(self) -> Point2D:
+        """The starting point of the line."""
+        return self._start
+
+    @start.setter
+    def start(self, value: Point2D) -> None:
+        self._start = value
+        self._invalidate_derived()
+
     @property
+    def end(self) -> Point2D:
+        """The ending point of the line."""
+        return self._end
+
+    @end.setter
+    def end(self, value: Point2D) -> None:
+        self._end = value
+        self._invalidate_derived()
+
+    @functools.cached_property
     def dx(self) -> float:
         """The x-component of the line."""
         return self.end.x - self.start.x
 
-    @property
+    @functools.cached_property
     def dy(self) -> float:
         """The y-component of the line."""
         return self.end.y - self.start.y
 
-    @property
+    @functools.cached_property
     def length(self) -> float:
         """The length of the line."""
-        return abs(math.sqrt(self.dx**2 + self.dy**2))
+        return math.hypot(self.dx, self.dy)
 
-    @property
+    @functools.cached_property
     def theta(self) -> float:
         """The angle of the line relative to the x-axis."""
         return math.atan2(self.dy, self.dx)
 
-    @property
+    @functools.cached_property
     def direction(self) -> Point2D:
         """A vector pointing in the direction of the line."""
-        return Point2D(math.cos(self.theta), math.sin(self.theta))
+        length = self.length
+        if not length:
+            return Point2D(1.0, 0.0)
+        return Point2D(self.dx / length, self.dy / length)
 
     @property
     @override
@@ -405,21 +696,23 @@ class SketchLine(SketchItem):
         """A reference to the owning sketch."""
         return self._sketch
 
+    @override
+    def _control_points(self) -> list[Point2D]:
+        return [self.start, self.end]
+
+    @override
+    def _load_control_points(self, points: Sequence[Point2D]) -> None:
+        self.start, self.end = points
+
     @override
     def rotate(self, origin: tuple[float, float], theta: float) -> "SketchLine":
-        new_start = self._rotate_point(
-            self.start,
-            Point2D.from_pair(origin),
-            degrees=theta,
-        )
-        new_end = self._rotate_point(self.end, Point2D.from_pair(origin), degrees=theta)
+        pivot = self._sketch._to_sketch_point(origin)
+        cos_t, sin_t = _cos_sin(theta * RADIANS_PER_DEGREE)
 
-        new_entity = SketchLine(
-            sketch=self._sketch,
-            start_point=new_start,
-            end_point=new_end,
-            units=self.units,
-        )
+        new_start = self._rotate_point_precomp(self.start, pivot, cos_t, sin_t)
+        new_end = self._rotate_point_precomp(self.end, pivot, cos_t, sin_t)
+
+        new_entity = self._clone_with(start=new_start, end=new_end)
         self._replace_entity(new_entity)
         return new_entity
 
@@ -429,50 +722,50 @@ class SketchLine(SketchItem):
         line_start: tuple[float, float],
         line_end: tuple[float, float],
     ) -> "SketchLine":
-        mirror_start = Point2D.from_pair(line_start)
-        mirror_end = Point2D.from_pair(line_end)
+        mirror_start = self._sketch._to_sketch_point(line_start)
+        mirror_end = self._sketch._to_sketch_point(line_end)
 
-        new_start = self._mirror_point(self.start, mirror_start, mirror_end)
-        new_end = self._mirror_point(self.end, mirror_start, mirror_end)
+        matrix = _mirror_matrix(mirror_start, mirror_end)
 
-        new_entity = SketchLine(
-            sketch=self._sketch,
-            start_point=new_start,
-            end_point=new_end,
-            units=self.units,
-        )
+        new_start = self._mirror_point_precomp(self.start, matrix)
+        new_end = self._mirror_point_precomp(self.end, matrix)
+
+        new_entity = self._clone_with(start=new_start, end=new_end)
         self._replace_entity(new_entity)
         return new_entity
 
     @override
-    def translate(self, x: float = 0, y: float = 0) -> "SketchLine":
+    def translate(
+        self,
+        x: float = 0,
+        y: float = 0,
+        *,
+        inplace: bool = False,
+    ) -> "SketchLine":
 
-        if self._sketch._client.units is UnitSystem.INCH:
-            x *= 0.0254
-            y *= 0.0254
+        x *= self._sketch._meters_per_unit
+        y *= self._sketch._meters_per_unit
+
+        if inplace:
+            return self._translate_inplace(x, y)
 
         new_start = Point2D(self.start.x + x, self.start.y + y)
         new_end = Point2D(self.end.x + x, self.end.y + y)
 
-        new_entity = SketchLine(
-            sketch=self._sketch,
-            start_point=new_start,
-            end_point=new_end,
-            units=self.units,
-        )
+        new_entity = self._clone_with(start=new_start, end=new_end)
         self._replace_entity(new_entity)
         return new_entity
 
     @override
     def to_model(self) -> schema.SketchCurveSegmentEntity:
-        return schema.SketchCurveSegmentEntity(
+        return schema.SketchCurveSegmentEntity.model_construct(
             entityId=self.entity_id,
             startPointId=f"{self.entity_id}.start",
             endPointId=f"{self.entity_id}.end",
-            startParam=0,
+            startParam=0.0,
             endParam=self.length,
             geometry={
-                "btType": "BTCurveGeometryLine-117",
+                "btType": schema.BT_CURVE_GEOMETRY_LINE,
                 "pntX": self.start.x,
                 "pntY": self.start.y,
                 "dirX": self.direction.x,
@@ -495,7 +788,7 @@ class SketchArc(SketchItem):
         center: Point2D,
         theta_interval: tuple[float, float],
         units: UnitSystem,
-        direction: tuple[float, float] = (1, 0),
+        direction: tuple[float, float] | Point2D = (1, 0),
         *,
         clockwise: bool = False,
     ) -> None:
@@ -503,7 +796,7 @@ class SketchArc(SketchItem):
         sketch: A reference to the owning sketch
         radius: The radius of the arc
         center: The centerpoint of the arc
-        theta_interval: The theta interval, in degrees
+        theta_interval: The theta interval, in radians
         units: The unit system to use
         direction: An optional direction to specify. Defaults to +x axis
         clockwise: Whether or not the arc is clockwise. Defaults to false.
@@ -513,7 +806,11 @@ class SketchArc(SketchItem):
         self.radius = radius
         self.center = center
         self.theta_interval = theta_interval
-        self.direction = direction
+        self.direction = (
+            direction
+            if isinstance(direction, Point2D)
+            else Point2D.from_pair(direction)
+        )
         self.clockwise = clockwise
         self.entity_id = self._generate_entity_id()
         self.units = units
@@ -524,81 +821,79 @@ class SketchArc(SketchItem):
         """A reference to the owning sketch."""
         return self._sketch
 
+    @override
+    def _control_points(self) -> list[Point2D]:
+        return [self.center]
+
+    @override
+    def _load_control_points(self, points: Sequence[Point2D]) -> None:
+        (self.center,) = points
+
+    @override
+    def _rotate_angles(self, theta: float) -> None:
+        self.theta_interval = (
+            self.theta_interval[0] + theta,
+            self.theta_interval[1] + theta,
+        )
+
+    @override
+    def _mirror_angles(self, line_angle: float) -> None:
+        # reflecting reverses the sweep, so the endpoints trade places
+        self.theta_interval = (
+            2 * line_angle - self.theta_interval[1],
+            2 * line_angle - self.theta_interval[0],
+        )
+
     @override
     def mirror(
         self,
         line_start: tuple[float, float],
         line_end: tuple[float, float],
     ) -> "SketchArc":
-        mirror_start = Point2D.from_pair(line_start)
-        mirror_end = Point2D.from_pair(line_end)
+        mirror_start = self._sketch._to_sketch_point(line_start)
+        mirror_end = self._sketch._to_sketch_point(line_end)
 
         # to avoid confusion
         del line_start
         del line_end
 
-        start_point = Point2D(
-            self.radius * math.cos(self.theta_interval[0]) + self.center.x,
-            self.radius * math.sin(self.theta_interval[0]) + self.center.y,
+        new_center = self._mirror_point_precomp(
+            self.center,
+            _mirror_matrix(mirror_start, mirror_end),
         )
-
-        start_point = self._mirror_point(start_point, mirror_start, mirror_end)
-        new_center = self._mirror_point(self.center, mirror_start, mirror_end)
-
-        arc_start_vector = np.array(
-            [start_point.x - new_center.x, start_point.y - new_center.y],
-        )
-        mirror_line_vector = np.array(
-            [mirror_end.x - mirror_start.x, mirror_end.y - mirror_start.y],
-        )
-
-        angle_offset = 2 * math.acos(
-            np.dot(arc_start_vector, mirror_line_vector)
-            / (np.linalg.norm(arc_start_vector) * np.linalg.norm(mirror_line_vector)),
-        )
-
-        d_theta = self.theta_interval[1] - self.theta_interval[0]
-
-        new_theta = (
-            (self.theta_interval[0] - angle_offset - d_theta),
-            (self.theta_interval[0] - angle_offset),
+        line_angle = math.atan2(
+            mirror_end.y - mirror_start.y,
+            mirror_end.x - mirror_start.x,
         )
 
-        new_entity = SketchArc(
-            sketch=self._sketch,
-            radius=self.radius,
-            center=new_center,
-            theta_interval=new_theta,
-            units=self.units,
-            direction=self.direction,
-            clockwise=self.clockwise,
-        )
+        new_entity = self._clone_with(center=new_center)
+        new_entity._mirror_angles(line_angle)
         self._replace_entity(new_entity)
         return new_entity
 
     @override
-    def translate(self, x: float = 0, y: float = 0) -> "SketchArc":
+    def translate(
+        self,
+        x: float = 0,
+        y: float = 0,
+        *,
+        inplace: bool = False,
+    ) -> "SketchArc":
+
+        x *= self._sketch._meters_per_unit
+        y *= self._sketch._meters_per_unit
 
-        if self._sketch._client.units is UnitSystem.INCH:
-            x *= 0.0254
-            y *= 0.0254
+        if inplace:
+            return self._translate_inplace(x, y)
 
         new_center = Point2D(self.center.x + x, self.center.y + y)
-        new_entity = SketchArc(
-            sketch=self._sketch,
-            radius=self.radius,
-            center=new_center,
-            theta_interval=self.theta_interval,
-            units=self.units,
-            direction=self.direction,
-            clockwise=self.clockwise,
-        )
+        new_entity = self._clone_with(center=new_center)
         self._replace_entity(new_entity)
         return new_entity
 
     @override
     def rotate(self, origin: tuple[float, float], theta: float) -> "SketchArc":
-        pivot = Point2D.from_pair(origin)
+        pivot = self._sketch._to_sketch_point(origin)
 
         start_point = Point2D(
             self.radius * math.cos(self.theta_interval[0]) + self.center.x,
@@ -609,9 +904,11 @@ class SketchArc(SketchItem):
             self.radius * math.sin(self.theta_interval[1]) + self.center.y,
         )
 
-        new_center = self._rotate_point(self.center, pivot, theta)
-        start_point = self._rotate_point(start_point, pivot, theta)
-        end_point = self._rotate_point(end_point, pivot, theta)
+        cos_t, sin_t = _cos_sin(theta * RADIANS_PER_DEGREE)
+
+        new_center = self._rotate_point_precomp(self.center, pivot, cos_t, sin_t)
+        start_point = self._rotate_point_precomp(start_point, pivot, cos_t, sin_t)
+        end_point = self._rotate_point_precomp(end_point, pivot, cos_t, sin_t)
 
         new_entity = SketchArc.three_point_with_midpoint(
             sketch=self._sketch,
@@ -622,6 +919,7 @@ class SketchArc(SketchItem):
             units=self.units,
             direction=self.direction,
             clockwise=self.clockwise,
+            validate=False,
         )
 
         self._replace_entity(new_entity)
@@ -629,7 +927,7 @@ class SketchArc(SketchItem):
 
     @override
     def to_model(self) -> schema.SketchCurveSegmentEntity:
-        return schema.SketchCurveSegmentEntity(
+        return schema.SketchCurveSegmentEntity.model_construct(
             startPointId=f"{self.entity_id}.start",
             endPointId=f"{self.entity_id}.end",
             startParam=self.theta_interval[0],
@@ -637,12 +935,12 @@ class SketchArc(SketchItem):
             centerId=f"{self.entity_id}.center",
             entityId=f"{self.entity_id}",
             geometry={
-                "btType": "BTCurveGeometryCircle-115",
+                "btType": schema.BT_CURVE_GEOMETRY_CIRCLE,
                 "radius": self.radius,
                 "xcenter": self.center.x,
                 "ycenter": self.center.y,
-                "xdir": self.direction[0],
-                "ydir": self.direction[1],
+                "xdir": self.direction.x,
+                "ydir": self.direction.y,
             },
         )
 
@@ -655,9 +953,10 @@ class SketchArc(SketchItem):
         endpoint_1: Point2D,
         endpoint_2: Point2D,
         units: UnitSystem,
-        direction: tuple[float, float] = (1, 0),
+        direction: tuple[float, float] | Point2D = (1, 0),
         *,
         clockwise: bool = False,
+        validate: bool = True,
     ) -> "SketchArc":
         """Construct a new instance of a SketchArc using endpoints instead
         of a theta interval.
@@ -671,28 +970,29 @@ class SketchArc(SketchItem):
             units: The unit system to use
             direction: An optional direction to specify. Defaults to +x axis
             clockwise: Whether or not the arc is clockwise. Defaults to false
+            validate: Check that the endpoints and radius describe an arc. Only
+                skip this for points that are known to be consistent
 
         Returns:
             A new SketchArc instance
 
         """
-        # verify that a valid arc can be found
-        if not math.isclose(
-            math.sqrt((center.x - endpoint_1.x) ** 2 + (center.y - endpoint_1.y) ** 2),
-            math.sqrt((center.x - endpoint_2.x) ** 2 + (center.y - endpoint_2.y) ** 2),
-        ):
-            msg = "No valid arc can be created from provided endpoints"
-            raise OnPyParameterError(msg)
+        if validate:
+            r_1 = math.hypot(center.x - endpoint_1.x, center.y - endpoint_1.y)
+            r_2 = math.hypot(center.x - endpoint_2.x, center.y - endpoint_2.y)
+
+            # verify that a valid arc can be found
+            if not math.isclose(r_1, r_2):
+                msg = "No valid arc can be created from provided endpoints"
+                raise OnPyParameterError(msg)
+
+            if radius is not None and not math.isclose(radius, r_1):
+                msg = "Endpoints do not match the provided radius"
+                raise OnPyParameterError(msg)
 
         # find radius
-        radius_from_endpoints = math.sqrt(
-            (center.x - endpoint_1.x) ** 2 + (center.y - endpoint_1.y) ** 2,
-        )
         if radius is None:
-            radius = radius_from_endpoints
-        elif not math.isclose(radius, radius_from_endpoints):
-            msg = "Endpoints do not match the provided radius"
-            raise OnPyParameterError(msg)
+            radius = math.hypot(center.x - endpoint_1.x, center.y - endpoint_1.y)
 
         # create line vectors from center to endpoints
         vec_1 = Point2D(endpoint_1.x - center.x, endpoint_1.y - center.y)
@@ -705,27 +1005,11 @@ class SketchArc(SketchItem):
         # calculate the difference in angles
         diff_theta = abs(theta_1 - theta_2)
 
-        # Choose the smaller arc
-        if diff_theta <= math.pi:
-            # if the difference is less than or equal to pi, choose the smaller arc
-            if clockwise:
-                # for clockwise arcs, choose the larger angle as the starting point
-                theta_start = max(theta_1, theta_2)
-                theta_end = min(theta_1, theta_2)
-            else:
-                # for counterclockwise arcs, choose the smaller angle as the
-                # starting point
-                theta_start = min(theta_1, theta_2)
-                theta_end = max(theta_1, theta_2)
-        elif clockwise:
-            # for clockwise arcs, choose the smaller angle as the starting point
-            theta_start = min(theta_1, theta_2)
-            theta_end = max(theta_1, theta_2)
-        else:
-            # for counterclockwise arcs, choose the larger angle as the
-            # starting point
-            theta_start = max(theta_1, theta_2)
-            theta_end = min(theta_1, theta_2)
+        # Always take the smaller arc: the larger angle starts the arc when
+        # exactly one of "spans more than pi" and "clockwise" holds
+        lo, hi = (theta_1, theta_2) if theta_1 < theta_2 else (theta_2, theta_1)
+        swap = (diff_theta > math.pi) ^ clockwise
+        theta_start, theta_end = (hi, lo) if swap else (lo, hi)
 
         # create theta interval
         theta_interval = (theta_start, theta_end)
@@ -747,3 +1031,133 @@ class SketchArc(SketchItem):
             f"Arc(center={self.center}, radius={self.radius}, "
             f"interval={self.theta_interval[0]}<θ<{self.theta_interval[1]})"
         )
+
+
+def _gather_points(items: Sequence[SketchItem]) -> tuple[np.ndarray, np.ndarray]:
+    """Stack the control points of many sketch items into coordinate arrays.
+
+    Args:
+        items: The items to collect points from
+
+    Returns:
+        The x and y coordinates of every control point, in item order
+
+    """
+    points = [p for item in items for p in item._control_points()]
+
+    xs = np.fromiter((p.x for p in points), dtype=np.float64, count=len(points))
+    ys = np.fromiter((p.y for p in points), dtype=np.float64, count=len(points))
+
+    return xs, ys
+
+
+def _scatter_points(
+    items: Sequence[SketchItem],
+    xs: np.ndarray,
+    ys: np.ndarray,
+) -> None:
+    """Load transformed coordinate arrays back into their sketch items.
+
+    Args:
+        items: The items that the points were gathered from
+        xs: The new x coordinates, in the order given by `_gather_points`
+        ys: The new y coordinates, in the order given by `_gather_points`
+
+    """
+    points = iter(
+        [Point2D(x, y) for x, y in zip(xs.tolist(), ys.tolist(), strict=True)],
+    )
+
+    for item in items:
+        item._load_control_points([next(points) for _ in item._control_points()])
+
+
+def _affine_apply(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    matrix: tuple[float, float, float, float],
+    offset: tuple[float, float],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Apply a 2D affine transform to arrays of points in a single matrix
+    product.
+
+    Args:
+        xs: The x coordinates of the points
+        ys: The y coordinates of the points
+        matrix: The (a, b, c, d) entries of the row-major linear part
+        offset: The (tx, ty) translation applied after the linear part
+
+    Returns:
+        The transformed x and y coordinates
+
+    """
+    out = np.array(matrix, dtype=np.float64).reshape(2, 2) @ np.vstack((xs, ys))
+    out[0] += offset[0]
+    out[1] += offset[1]
+
+    return out[0], out[1]
+
+
+def _rotate_points_np(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    pivot: Point2D,
+    theta: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rotate arrays of points about a pivot.
+
+    Args:
+        xs: The x coordinates of the points
+        ys: The y coordinates of the points
+        pivot: The point to rotate about
+        theta: The radians to rotate by. Positive is ccw
+
+    Returns:
+        The rotated x and y coordinates
+
+    """
+    a, b, c, d, tx, ty = _rotation_matrix(pivot, theta)
+    return _affine_apply(xs, ys, (a, b, c, d), (tx, ty))
+
+
+def _mirror_points_np(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    line_start: Point2D,
+    line_end: Point2D,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mirror arrays of points across a line.
+
+    Args:
+        xs: The x coordinates of the points
+        ys: The y coordinates of the points
+        line_start: The point where the line starts
+        line_end: The point where the line ends
+
+    Returns:
+        The mirrored x and y coordinates
+
+    """
+    a, b, c, d, tx, ty = _mirror_matrix(line_start, line_end)
+    return _affine_apply(xs, ys, (a, b, c, d), (tx, ty))
+
+
+def _translate_points_np(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    x: float,
+    y: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Translate arrays of points.
+
+    Args:
+        xs: The x coordinates of the points
+        ys: The y coordinates of the points
+        x: The distance to translate along the x-axis
+        y: The distance to translate along the y-axis
+
+    Returns:
+        The translated x and y coordinates
+
+    """
+    return xs + x, ys + y
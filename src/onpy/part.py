@@ -23,6 +23,18 @@ if TYPE_CHECKING:
     from onpy.elements.partstudio import PartStudio
 
 
+_OWNED_BY_TYPE_SCRIPT = dedent(
+    """
+    function(context is Context, queries) {{
+        var part = {{ "queryType" : QueryType.TRANSIENT, "transientId" : "{part_id}" }} as Query;
+        var part_faces = qOwnedByBody(part, EntityType.{type_name});
+
+        return transientQueriesToStrings( evaluateQuery(context, part_faces) );
+    }}
+    """,
+)
+
+
 class Part(BodyEntityConvertible):
     """Represents a Part in an OnShape partstudio."""
 
@@ -54,15 +66,9 @@ class Part(BodyEntityConvertible):
             A list of transient ids of the resulting queries
 
         """
-        script = dedent(
-            f"""
-            function(context is Context, queries) {{
-                var part = {{ "queryType" : QueryType.TRANSIENT, "transientId" : "{self.id}" }} as Query;
-                var part_faces = qOwnedByBody(part, EntityType.{type_name.upper()});
-
-                return transientQueriesToStrings( evaluateQuery(context, part_faces) );
-            }}
-            """,  # noqa: E501
+        script = _OWNED_BY_TYPE_SCRIPT.format(
+            part_id=self.id,
+            type_name=type_name.upper(),
         )
 
         response = self._client._api.endpoints.eval_featurescript(
@@ -6,14 +6,18 @@ OnPy - May 2024 - Kyle Tennison
 
 """
 
+import functools
 import math
 from dataclasses import dataclass
 from enum import Enum
-from typing import Self
+from typing import Final, Self
 
 from onpy.api.schema import NameIdFetchable
 from onpy.util.exceptions import OnPyParameterError
 
+METERS_PER_INCH: Final = 0.0254
+RADIANS_PER_DEGREE: Final = math.pi / 180
+
 
 def find_by_name_or_id[
     T: NameIdFetchable
@@ -129,10 +133,17 @@ class UnitSystem(Enum):
         """The featurescript name of the unit system."""
         return {UnitSystem.INCH: "inch", UnitSystem.METRIC: "meter"}[self]
 
+    @property
+    def meters_per_unit(self) -> float:
+        """The factor that converts a length in this unit system to meters."""
+        return METERS_PER_INCH if self is UnitSystem.INCH else 1.0
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Point2D:
-    """Represents a 2D point."""
+    """Represents a 2D point. Points are immutable and hashable, so equal
+    pairs may share an instance.
+    """
 
     x: float
     y: float
@@ -159,9 +170,15 @@ class Point2D:
             return self.x == other.x and self.y == other.y
         return False
 
+    def __hash__(self) -> int:
+        """Hash a point by its coordinates, consistent with `__eq__`."""
+        return hash((self.x, self.y))
+
     @classmethod
-    def from_pair(cls, pair: tuple[float, float]) -> Self:
+    def from_pair(cls, pair: tuple[float, float]) -> "Point2D":
         """Create a point from an ordered pair."""
+        if type(pair) is tuple and cls is Point2D:
+            return _point_from_tuple(pair)
         return cls(*pair)
 
     @property
@@ -172,5 +189,14 @@ class Point2D:
     @staticmethod
     def approx(point1: "Point2D", point2: "Point2D", error: float = 1e-8) -> bool:
         """Check if two points are approximately equal."""
-        distance = math.sqrt((point1.x - point2.x) ** 2 + (point1.y - point2.y) ** 2)
-        return distance < error
+        dx = point1.x - point2.x
+        dy = point1.y - point2.y
+        return dx * dx + dy * dy < error * error
+
+
+@functools.lru_cache(maxsize=128)
+def _point_from_tuple(pair: tuple[float, float]) -> Point2D:
+    """Build a point from a tuple, reusing instances for repeated pairs like
+    the default (1, 0) direction.
+    """
+    return Point2D(*pair)
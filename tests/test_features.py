@@ -1,6 +1,8 @@
 import onpy
 from onpy import Client
 from onpy.api.versioning import WorkspaceWVM
+from onpy.entities import EntityFilter
+from onpy.util.misc import Point2D
 
 
 def test_sketch_extrude():
@@ -132,6 +134,172 @@ def test_pseudo_elements():
     document.delete()
 
 
+def test_bulk_transforms():
+    """Tests the ability to mirror, rotate, and translate many items with a
+    single upload."""
+
+    document = Client().create_document("test_features::test_bulk_transforms")
+    partstudio = document.get_partstudio()
+
+    partstudio.wipe()
+
+    sketch = partstudio.add_sketch(plane=partstudio.features.top_plane)
+
+    lines = sketch.trace_points((1, 0), (1.5, 1), (2.5, 1), end_connect=False)
+    arc = sketch.add_centerpoint_arc(
+        centerpoint=(2.5, 0), radius=1, start_angle=0, end_angle=90
+    )
+
+    sketch.bulk_mirror([*lines, arc], line_point=(0, 0), line_dir=(1, 0), copy=True)
+    sketch.bulk_translate(sketch.sketch_items, x=1, y=1)
+    sketch.bulk_rotate(sketch.sketch_items, origin=(0, 0), theta=90, copy=True)
+
+    assert len(sketch.sketch_items) == 12
+
+    document.delete()
+
+
+def test_sketch_transform_geometry():
+    """Tests where mirrored, rotated and cloned items end up"""
+
+    document = Client().create_document("test_features::test_sketch_transform_geometry")
+    partstudio = document.get_partstudio()
+
+    partstudio.wipe()
+
+    sketch = partstudio.add_sketch(plane=partstudio.features.top_plane)
+
+    # pivots and mirror lines are in the client's units, like the items
+    line = sketch.add_line((1, 0), (2, 0))
+    (rotated,) = sketch.rotate([line], origin=(1, 1), theta=90)
+    assert Point2D.approx(rotated.start, Point2D(2, 1) * 0.0254)
+    assert Point2D.approx(rotated.end, Point2D(2, 2) * 0.0254)
+
+    # the mirror line runs through line_point along line_dir
+    line = sketch.add_line((1, 1), (2, 1))
+    (mirrored,) = sketch.mirror([line], line_point=(0, 3), line_dir=(1, 0))
+    assert Point2D.approx(mirrored.start, Point2D(1, 5) * 0.0254)
+    assert Point2D.approx(mirrored.end, Point2D(2, 5) * 0.0254)
+
+    clone = line.clone()
+    assert clone.entity_id != line.entity_id
+
+    # both mirror paths reflect an arc's angles the same way
+    arc = sketch.add_centerpoint_arc(
+        centerpoint=(1, 0), radius=1, start_angle=10, end_angle=60
+    )
+    (mirrored_arc,) = sketch.mirror([arc], line_point=(0, 0), line_dir=(1, 1))
+    (bulk_arc,) = sketch.bulk_mirror([arc], line_point=(0, 0), line_dir=(1, 1))
+    assert Point2D.approx(mirrored_arc.center, bulk_arc.center)
+    assert Point2D.approx(
+        Point2D.from_pair(mirrored_arc.theta_interval),
+        Point2D.from_pair(bulk_arc.theta_interval),
+    )
+
+    document.delete()
+
+
+def test_composed_transforms():
+    """Tests the ability to apply several transforms to an item at once"""
+
+    document = Client().create_document("test_features::test_composed_transforms")
+    partstudio = document.get_partstudio()
+
+    partstudio.wipe()
+
+    sketch = partstudio.add_sketch(plane=partstudio.features.top_plane)
+
+    line = sketch.add_line((0, 0), (1, 0))
+    line = line.compose(
+        sketch.affine_rotate(origin=(0, 0), theta=90),
+        sketch.affine_translate(x=1),
+        sketch.affine_mirror(line_start=(0, 0), line_end=(0, 1)),
+    )
+
+    # rotated onto the y-axis, shifted right, then mirrored to the left
+    assert abs(line.start.x - line.end.x) < 1e-8
+    assert line.start.x < 0
+    assert len(sketch.sketch_items) == 1
+
+    document.delete()
+
+
+def test_batched_features():
+    """Tests the ability to queue features and upload them together"""
+
+    document = Client().create_document("test_features::test_batched_features")
+    partstudio = document.get_partstudio()
+    partstudio.wipe()
+
+    sketch = partstudio.add_sketch(partstudio.features.top_plane)
+    sketch.add_circle((-2, 0), radius=1)
+    sketch.add_circle((2, 0), radius=1)
+
+    with partstudio.batch():
+        left = partstudio.add_extrude(sketch.faces.contains_point((-2, 0, 0)), 1)
+        right = partstudio.add_extrude(sketch.faces.contains_point((2, 0, 0)), 2)
+
+        assert len(partstudio._pending_features) == 2
+
+    assert len(partstudio._pending_features) == 0
+    assert left.id is not None
+    assert right.id is not None
+    assert len(partstudio.parts) == 2
+
+    document.delete()
+
+
+def test_batched_offset_plane():
+    """Tests that using a queued offset plane uploads it early"""
+
+    document = Client().create_document("test_features::test_batched_offset_plane")
+    partstudio = document.get_partstudio()
+    partstudio.wipe()
+
+    with partstudio.batch():
+        plane = partstudio.add_offset_plane(partstudio.features.top_plane, 2)
+        assert len(partstudio._pending_features) == 1
+
+        sketch = partstudio.add_sketch(plane)
+        assert len(partstudio._pending_features) == 0
+
+        sketch.add_circle((0, 0), radius=1)
+        partstudio.add_extrude(sketch, 1)
+
+    assert len(partstudio.parts) == 1
+
+    document.delete()
+
+
+def test_batched_queries():
+    """Tests the ability to evaluate several entity filters at once"""
+
+    document = Client().create_document("test_features::test_batched_queries")
+    partstudio = document.get_partstudio()
+    partstudio.wipe()
+
+    sketch = partstudio.add_sketch(partstudio.features.top_plane)
+    sketch.add_circle((-2, 0), radius=1)
+    sketch.add_circle((2, 0), radius=1)
+
+    faces = sketch.faces
+    left = faces.contains_point((-2, 0, 0))
+    right = faces.contains_point((2, 0, 0))
+    neither = faces.contains_point((0, 5, 0))
+
+    EntityFilter.evaluate(left, right, neither)
+
+    assert len(left._available) == 1
+    assert len(right._available) == 1
+    assert len(neither._available) == 0
+    assert left._available[0].transient_id != right._available[0].transient_id
+
+    by_point = faces.contains_points([(-2, 0, 0), (2, 0, 0), (0, 5, 0)])
+    assert [len(f._available) for f in by_point] == [1, 1, 0]
+
+    document.delete()
+
+
 def test_part_query():
     """Tests the ability to query a part"""
 